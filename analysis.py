@@ -1,40 +1,113 @@
+# analysis.py
+"""Análisis estocástico de una corrida: supervivencia y movimiento.
+
+`collect_analysis_data` toma de las criaturas y de `trajectory.trajectories` solo arrays
+de NumPy, así el análisis puede correr en otro proceso (`start_analysis`) mientras la
+interfaz sigue. La ventana no guarda las criaturas muertas: anota sus tiempos de
+supervivencia (`survival_times`) al quitarlas de la población. Los ángulos de giro y los largos de paso se calculan de una vez para
+todas las trayectorias guardadas, y el ajuste Weibull usa una submuestra si hay muchos
+tiempos de supervivencia.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import weibull_min, kstest
 
-def analyze_creature_data(creatures):
-    """Generate stochastic analysis visualizations"""
+from config import ANALYSIS_FIT_SAMPLE
+from trajectory import trajectories
+
+_executor = None  # Proceso de análisis en segundo plano (se crea al primer uso)
+
+def survival_times(creatures):
+    """Tiempos de supervivencia de las criaturas muertas de `creatures`."""
+    return np.array([c.time_alive for c in creatures if c.death_time is not None], dtype=np.float64)
+
+def saved_paths():
+    """Trayectorias guardadas en `trajectories` que tienen pasos, ordenadas por id."""
+    paths = [trajectories.get(creature_id) for creature_id in sorted(trajectories.ids())]
+    return [path for path in paths if len(path)]
+
+def collect_analysis_data(creatures):
+    """Tiempos de supervivencia de las criaturas muertas y trayectorias guardadas, ordenadas por id."""
+    return survival_times(creatures), saved_paths()
+
+def movement_statistics(paths):
+    """Ángulos de giro en [0, 2*pi) y largos de paso de todas las trayectorias a la vez."""
+    if not paths:
+        return np.empty(0), np.empty(0)
+    points = np.concatenate(paths).astype(np.float64)
+    lengths = np.array([len(path) for path in paths])
+    # Pasos entre puntos consecutivos de una misma trayectoria
+    step_owner = np.repeat(np.arange(len(paths)), lengths)
+    dx, dy = np.diff(points[:, 0]), np.diff(points[:, 1])
+    same_path = step_owner[1:] == step_owner[:-1]
+    dx, dy, owner = dx[same_path], dy[same_path], step_owner[1:][same_path]
+    heading = np.arctan2(dy, dx)
+    turns = np.diff(heading)[owner[1:] == owner[:-1]]
+    return turns % (2 * np.pi), np.sqrt(dx ** 2 + dy ** 2)
+
+def analyze(survival_times, paths, fit_sample=ANALYSIS_FIT_SAMPLE, seed=0):
+    """Genera survival_analysis.png, movement_path.png, turning_angles.png y step_lengths.png.
+
+    Devuelve la lista de archivos escritos.
+    """
+    # matplotlib y scipy tardan en importarse: solo los carga el proceso que dibuja
+    import matplotlib
+    matplotlib.use("Agg")  # Sin ventana: las figuras solo se guardan como PNG
+    import matplotlib.pyplot as plt
+    from scipy.stats import weibull_min
+
+    written = []
     # 1. Survival Analysis
-    survival_times = [c.time_alive for c in creatures if c.death_time]
-    if survival_times:
+    if len(survival_times):
         plt.figure()
         plt.hist(survival_times, bins=20, density=True, alpha=0.6, label='Data')
-        
-        # Fit Weibull distribution
-        shape, loc, scale = weibull_min.fit(survival_times)
-        x = np.linspace(min(survival_times), max(survival_times), 100)
+
+        # Fit Weibull distribution (sobre una submuestra si hay demasiados datos)
+        sample = survival_times
+        if fit_sample and len(sample) > fit_sample:
+            sample = np.random.default_rng(seed).choice(sample, fit_sample, replace=False)
+        shape, loc, scale = weibull_min.fit(sample)
+        x = np.linspace(survival_times.min(), survival_times.max(), 100)
         plt.plot(x, weibull_min.pdf(x, shape, loc, scale), 'r-', label='Weibull Fit')
         plt.title('Survival Time Distribution')
         plt.legend()
         plt.savefig('survival_analysis.png')
-    
-    # 2. Movement Analysis (for first creature)
-    if creatures and creatures[0].movement_history:
-        x, y, _ = zip(*creatures[0].movement_history)
+        plt.close()
+        written.append('survival_analysis.png')
+
+    # 2. Movement Analysis (camino de la primera criatura seguida, giros y pasos de todas)
+    if paths:
         plt.figure()
-        plt.plot(x, y, 'b-', alpha=0.5)
+        plt.plot(paths[0][:, 0], paths[0][:, 1], 'b-', alpha=0.5)
         plt.title('Creature Movement Path')
         plt.savefig('movement_path.png')
-        
-        # Calculate turning angles
-        angles = []
-        for i in range(1, len(x)-1):
-            dx1, dy1 = x[i]-x[i-1], y[i]-y[i-1]
-            dx2, dy2 = x[i+1]-x[i], y[i+1]-y[i]
-            angle = np.arctan2(dy2, dx2) - np.arctan2(dy1, dx1)
-            angles.append(angle % (2*np.pi))
-        
+        plt.close()
+        written.append('movement_path.png')
+
+        angles, steps = movement_statistics(paths)
         plt.figure()
         plt.hist(angles, bins=36)
         plt.title('Turning Angle Distribution')
-        plt.savefig('turning_angles.png')
\ No newline at end of file
+        plt.savefig('turning_angles.png')
+        plt.close()
+        plt.figure()
+        plt.hist(steps, bins=30)
+        plt.title('Step Length Distribution')
+        plt.savefig('step_lengths.png')
+        plt.close()
+        written += ['turning_angles.png', 'step_lengths.png']
+    return written
+
+def analyze_creature_data(creatures):
+    """Generate stochastic analysis visualizations"""
+    return analyze(*collect_analysis_data(creatures))
+
+def start_analysis(times):
+    """Corre el análisis de los tiempos de supervivencia `times` en un proceso aparte.
+
+    Devuelve un Future con los archivos escritos.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=1)
+    return _executor.submit(analyze, np.asarray(times, dtype=np.float64), saved_paths())
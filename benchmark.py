@@ -0,0 +1,291 @@
+# benchmark.py
+"""Mediciones de rendimiento de las partes calientes de la simulación.
+
+Cada escenario arma un mundo con semilla fija (cantidad de criaturas, comida, porcentaje
+de carnívoros y, opcionalmente, lado del mundo en celdas) y mide el motor de objetos (`simulate_generation`, `reproduce`,
+`Creature.move`), el motor de arrays, el dibujo (`visualize_population`) y la exportación
+(`save_to_csv`, `analyze_creature_data`). Se informa el tiempo por unidad (tick, llamada,
+cuadro o criatura) y, en una segunda pasada con tracemalloc, el pico de memoria y los
+bloques que quedan asignados.
+
+`--startup` mide además cuánto tarda un intérprete nuevo en importar los módulos de
+entrada (la ventana, el modo sin pantalla y los procesos de réplicas y barridos).
+
+Uso: python benchmark.py --scenarios small 1k --save baseline.json
+     python benchmark.py --compare baseline.json
+     python benchmark.py --scenarios --startup
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from config import DEFAULT_PARAMS
+from creature import Creature
+from population_arrays import ArrayPopulation
+from sim_clock import sim_clock
+from sim_random import sim_random
+from simulation import create_population, create_food, simulate_generation, reproduce, needs_compaction, compact_population
+from spatial_grid import SpatialGrid
+from sweep import config_overrides
+from trajectory import trajectories
+from stats_tracker import stats
+
+SCENARIOS = {
+    "small": {"population": 100, "food": 50, "carnivore_percentage": 20, "ticks": 20},
+    "1k": {"population": 1_000, "food": 500, "carnivore_percentage": 20, "ticks": 10},
+    "1k-food-sparse": {"population": 1_000, "food": 20, "carnivore_percentage": 20, "ticks": 10},
+    "1k-food-dense": {"population": 1_000, "food": 20_000, "carnivore_percentage": 20, "ticks": 10},
+    "1k-carnivores-high": {"population": 1_000, "food": 500, "carnivore_percentage": 60, "ticks": 10},
+    "1k-carnivores-low": {"population": 1_000, "food": 500, "carnivore_percentage": 2, "ticks": 10},
+    "10k": {"population": 10_000, "food": 5_000, "carnivore_percentage": 20, "ticks": 3},
+    "100k": {"population": 100_000, "food": 50_000, "carnivore_percentage": 20, "ticks": 1},
+    "10k-world-1000": {"population": 10_000, "food": 5_000, "carnivore_percentage": 20, "ticks": 3, "world": 1_000},
+}
+DEFAULT_SCENARIOS = ("small", "1k", "1k-food-sparse", "1k-food-dense", "1k-carnivores-high", "1k-carnivores-low", "10k")
+STARTUP_MODULES = ("config", "headless", "replicates", "ui", "main")
+TOLERANCE = 0.2  # Aumento relativo del tiempo por unidad que cuenta como regresión
+
+def build_world(scenario, seed):
+    """Población inicial y comida del escenario, con todo el estado global reiniciado."""
+    spec = SCENARIOS[scenario]
+    random.seed(seed)
+    sim_random.seed(seed)
+    Creature.unique_id = 0
+    sim_clock.reset()
+    trajectories.reset()
+    stats.reset()
+    params = {**DEFAULT_PARAMS, "carnivore_percentage": spec["carnivore_percentage"]}
+    return create_population(spec["population"], params), create_food(spec["food"])
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+# Cada benchmark recibe (escenario, semilla) y devuelve {nombre: (unidad, [(segundos, unidades), ...])}
+
+def bench_objects(scenario, seed):
+    """Ticks del motor de objetos: `simulate_generation` y `reproduce` por separado."""
+    population, food_sources = build_world(scenario, seed)
+    generation, births = [], []
+    dead_in_population = 0
+    for _ in range(SCENARIOS[scenario]["ticks"]):
+        seconds, deaths = _timed(simulate_generation, population, food_sources)
+        generation.append((seconds, 1))
+        seconds, children = _timed(reproduce, population)
+        births.append((seconds, 1))
+        population.extend(children)
+        dead_in_population += deaths
+        if needs_compaction(population, dead_in_population):
+            compact_population(population, [])
+            dead_in_population = 0
+        sim_clock.advance()
+    return {"simulate_generation": ("tick", generation), "reproduce": ("tick", births)}
+
+def bench_arrays(scenario, seed):
+    """Ticks del motor de arrays: `ArrayPopulation.step` y `ArrayPopulation.reproduce`."""
+    population, food_sources = build_world(scenario, seed)
+    population = ArrayPopulation.from_creatures(population)
+    steps, births = [], []
+    dead_in_population = 0
+    for _ in range(SCENARIOS[scenario]["ticks"]):
+        seconds, deaths = _timed(population.step, food_sources)
+        steps.append((seconds, 1))
+        seconds, _ = _timed(population.reproduce)
+        births.append((seconds, 1))
+        dead_in_population += deaths
+        if needs_compaction(population, dead_in_population):
+            population.compact([])
+            dead_in_population = 0
+        sim_clock.advance()
+    return {"arrays_step": ("tick", steps), "arrays_reproduce": ("tick", births)}
+
+def bench_move(scenario, seed):
+    """`Creature.move` de toda la población, medido por llamada."""
+    population, food_sources = build_world(scenario, seed)
+    samples = []
+    for _ in range(SCENARIOS[scenario]["ticks"]):
+        sim_random.prepare(len(population))
+        creature_grid = SpatialGrid.from_objects(population)
+        start = time.perf_counter()
+        for creature in population:
+            creature.move(food_sources, population, creature_grid)
+            creature_grid.move(creature)
+        samples.append((time.perf_counter() - start, len(population)))
+        sim_clock.advance()
+    return {"move": ("call", samples)}
+
+def bench_visualize(scenario, seed):
+    """Un cuadro de `visualize_population` con el driver de video sin pantalla."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # La salida estándar es JSON
+    try:
+        import pygame
+        from config import SCREEN_SIZE, CELL_SIZE, GRID_SIZE
+        from ui import Camera, visualize_population
+    except ImportError:
+        return {}
+    population, food_sources = build_world(scenario, seed)
+    screen = pygame.display.set_mode((SCREEN_SIZE, SCREEN_SIZE))
+    world = Camera(SCREEN_SIZE, SCREEN_SIZE, SCENARIOS[scenario].get("world", GRID_SIZE))
+    # Vista acercada al centro del mundo, con celdas de CELL_SIZE píxeles: casi todo queda fuera de la ventana
+    viewport = Camera(SCREEN_SIZE, SCREEN_SIZE, world.world_size)
+    viewport.zoom_at(CELL_SIZE / viewport.zoom, SCREEN_SIZE / 2, SCREEN_SIZE / 2)
+    results = {}
+    for name, camera in (("visualize_population", world), ("visualize_viewport", viewport)):
+        frames = [(_timed(visualize_population, screen, population, food_sources, None, camera)[0], 1)
+                  for _ in range(SCENARIOS[scenario]["ticks"])]
+        results[name] = ("frame", frames)
+    return results
+
+def bench_export(scenario, seed):
+    """`save_to_csv` y `analyze_creature_data` sobre las criaturas de unos ticks del motor de arrays."""
+    population, food_sources = build_world(scenario, seed)
+    population = ArrayPopulation.from_creatures(population)
+    for _ in range(SCENARIOS[scenario]["ticks"]):
+        population.step(food_sources)
+        population.reproduce()
+        sim_clock.advance()
+    creatures = list(population)
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # Los dos escriben archivos en el directorio actual (index.txt, CSV y PNG)
+        os.chdir(directory)
+        try:
+            from utils import save_to_csv
+            results["save_to_csv"] = ("creature", [(_timed(save_to_csv, creatures)[0], len(creatures))])
+            try:
+                import matplotlib
+                matplotlib.use("Agg")
+                from analysis import analyze_creature_data
+            except ImportError:
+                return results
+            results["analyze_creature_data"] = ("creature", [(_timed(analyze_creature_data, creatures)[0], len(creatures))])
+            matplotlib.pyplot.close("all")
+        finally:
+            os.chdir(cwd)
+    return results
+
+BENCHMARKS = {
+    "objects": bench_objects,
+    "arrays": bench_arrays,
+    "move": bench_move,
+    "visualize": bench_visualize,
+    "export": bench_export,
+}
+
+def _summarize(unit, samples):
+    per_unit = [seconds / units for seconds, units in samples if units]
+    return {
+        "unit": unit,
+        "seconds_per_unit": sum(seconds for seconds, _ in samples) / max(sum(units for _, units in samples), 1),
+        "min": min(per_unit, default=0.0),
+        "max": max(per_unit, default=0.0),
+        "samples": len(samples),
+    }
+
+def bench_startup(modules=STARTUP_MODULES, repeat=5):
+    """Segundos que tarda un intérprete nuevo en importar cada módulo ("python" es el intérprete solo)."""
+    env = {**os.environ, "SDL_VIDEODRIVER": "dummy", "PYGAME_HIDE_SUPPORT_PROMPT": "1"}
+    base = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for module in ("python", *modules):
+        statement = "pass" if module == "python" else f"import {module}"
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", statement], cwd=base, env=env, check=True, stdout=subprocess.DEVNULL)
+            samples.append((time.perf_counter() - start, 1))
+        results[f"startup/{module}"] = _summarize("process", samples)
+    return results
+
+def _run_benchmark(results, scenario, benchmark, seed, memory):
+    for name, (unit, samples) in BENCHMARKS[benchmark](scenario, seed).items():
+        results[f"{scenario}/{name}"] = _summarize(unit, samples)
+    if not memory:
+        return
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        names = BENCHMARKS[benchmark](scenario, seed)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    net_blocks = sys.getallocatedblocks() - blocks
+    for name in names:
+        # El pico es el del grupo completo (los nombres de un mismo benchmark corren juntos)
+        results[f"{scenario}/{name}"].update(peak_bytes=peak, net_blocks=net_blocks)
+
+def run_benchmarks(scenarios=DEFAULT_SCENARIOS, benchmarks=tuple(BENCHMARKS), seed=0, memory=True):
+    """Corre los benchmarks en cada escenario y devuelve {"escenario/nombre": resultado}.
+
+    Con `memory` cada benchmark se repite con tracemalloc activo (que lo hace más lento) para
+    medir el pico de memoria y los bloques netos asignados sin afectar los tiempos.
+    """
+    results = {}
+    for scenario in scenarios:
+        for benchmark in benchmarks:
+            with config_overrides({"GRID_SIZE": SCENARIOS[scenario]["world"]} if "world" in SCENARIOS[scenario] else {}):
+                _run_benchmark(results, scenario, benchmark, seed, memory)
+    return results
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Entradas de `results` cuyo tiempo por unidad supera al de `baseline` en más de `tolerance`."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None or not reference["seconds_per_unit"]:
+            continue
+        ratio = result["seconds_per_unit"] / reference["seconds_per_unit"]
+        if ratio > 1 + tolerance:
+            regressions.append({"benchmark": key, "ratio": ratio, "seconds_per_unit": result["seconds_per_unit"],
+                                "baseline": reference["seconds_per_unit"]})
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de rendimiento de la simulación.")
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS), default=list(DEFAULT_SCENARIOS),
+                        help="Escenarios a medir (100k no se corre por defecto).")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--startup", action="store_true", help="Medir también el tiempo de importación de los módulos de entrada.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="No repetir con tracemalloc para medir memoria.")
+    parser.add_argument("--save", default=None, help="Guardar los resultados como línea de base JSON.")
+    parser.add_argument("--compare", default=None, help="Línea de base JSON contra la que comparar.")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Aumento relativo tolerado antes de marcar una regresión.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args.scenarios, args.benchmarks, seed=args.seed, memory=not args.no_memory)
+    if args.startup:
+        results.update(bench_startup())
+    output = {
+        "meta": {"seed": args.seed, "python": platform.python_version(), "numpy": np.__version__,
+                 "machine": platform.machine(), "processor": platform.processor()},
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(output, file, indent=2)
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file)["results"], args.tolerance)
+        output["regressions"] = regressions
+    print(json.dumps(output, indent=2))
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
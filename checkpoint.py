@@ -0,0 +1,304 @@
+# checkpoint.py
+"""Puntos de control binarios de una corrida de `headless.simulate`.
+
+Un punto de control es un único .npz sin comprimir: las columnas de la población,
+las celdas con comida, las variables aleatorias ya sorteadas y las trayectorias van
+como arrays de NumPy, y el resto (tick, régimen de comida, contadores, estado de los
+generadores) en un encabezado JSON guardado como bytes. No se usa pickle.
+
+`load_checkpoint` también restaura los singletons de la corrida (sim_clock,
+sim_random, random, Creature.unique_id, trajectories y stats), así que la corrida
+sigue exactamente igual que si no se hubiera interrumpido. Con `branch` se cambia la
+semilla después de cargar: varias ramas parten del mismo mundo ya calentado.
+
+Uso: python headless.py --ticks 5000 --checkpoint mundo.npz --checkpoint-every 500
+     python headless.py --ticks 8000 --resume mundo.npz --branch 7
+"""
+import gc
+import json
+import os
+import random
+from contextlib import contextmanager
+from operator import attrgetter
+
+import numpy as np
+
+from creature import Creature
+from food import FoodField
+from food_regime import FoodRegime
+from events import EventScheduler
+from population_arrays import ArrayPopulation, PERSONALITIES
+from sim_clock import sim_clock
+from sim_random import sim_random
+from trajectory import trajectories
+from stats_tracker import stats
+
+FORMAT_VERSION = 1
+# Atributos de Creature guardados como float64; None se guarda como NaN y el tipo original va en `kinds`
+FLOAT_FIELDS = ("x", "y", "prev_x", "prev_y", "prev_angle", "speed", "birth_time", "eat_time", "death_time", "time_alive")
+INT_FIELDS = ("id", "size", "food_eaten", "food_eaten_total", "reproductions")
+BOOL_FIELDS = ("is_carnivore", "alive")
+OPTIONAL_FIELDS = ("prev_angle", "death_time")
+KINDS = (float, int, np.float64)  # Tipos de Python/NumPy que pueden tener los atributos de FLOAT_FIELDS
+# Papel de cada fila de la tabla de criaturas
+POPULATION, ARCHIVE, STATS_ONLY = range(3)
+TOP_K_FIELDS = ("time_alive", "food_eaten", "reproductions")  # Atributo que ordena cada TopK de stats
+
+@contextmanager
+def _gc_paused():
+    """Pausa el recolector de basura: armar o leer las columnas de cientos de miles de
+    criaturas crea muchos objetos y lo dispararía una y otra vez sin nada que liberar."""
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if collecting:
+            gc.enable()
+
+def _colour_table(colors):
+    return np.array(colors, dtype=np.int16).reshape(-1, 3)
+
+def _creature_table(creatures, roles):
+    """Columnas de una lista de criaturas (Creature o CreatureView) con el papel de cada fila.
+
+    Los atributos se leen una vez por criatura; el resto (tipos, familias, personalidades)
+    se calcula por columna.
+    """
+    names = FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS + ("personality", "parent_color")
+    rows = list(zip(*map(attrgetter(*names), creatures))) or [()] * len(names)
+    columns = dict(zip(names, rows))
+    table = {}
+    codes = {kind: code for code, kind in enumerate(KINDS)}
+    table["kinds"] = np.zeros((len(creatures), len(FLOAT_FIELDS)), dtype=np.int8)
+    for column, name in enumerate(FLOAT_FIELDS):
+        values = columns[name]
+        kinds = set(map(type, values))
+        if name in OPTIONAL_FIELDS and type(None) in kinds:
+            values = [np.nan if value is None else value for value in values]
+        table[name] = np.array(values, dtype=np.float64)
+        if len(kinds) == 1:
+            table["kinds"][:, column] = codes.get(kinds.pop(), 0)
+        else:
+            lookup = {kind: codes.get(kind, 0) for kind in kinds}
+            table["kinds"][:, column] = np.fromiter(map(lookup.__getitem__, map(type, columns[name])), dtype=np.int8, count=len(creatures))
+    for name in INT_FIELDS:
+        table[name] = np.array(columns[name], dtype=np.int64)
+    for name in BOOL_FIELDS:
+        table[name] = np.array(columns[name], dtype=np.bool_)
+    colors = _colour_table(columns["parent_color"]).astype(np.int32)
+    # Cada color como un entero: las familias salen de un solo np.unique
+    _, first, family = np.unique((colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2], return_index=True, return_inverse=True)
+    table["family"] = family.astype(np.int32).reshape(-1)
+    table["colors"] = colors[first].astype(np.int16)
+    personalities = {name: code for code, name in enumerate(PERSONALITIES)}
+    table["personality"] = np.fromiter(map(personalities.__getitem__, columns["personality"]), dtype=np.int8, count=len(creatures))
+    table["role"] = np.array(roles, dtype=np.int8)
+    return table
+
+def _float_column(values, kinds, optional=False):
+    """Valores de una columna de FLOAT_FIELDS con el tipo original de cada fila (`kinds`).
+
+    Se convierte por tipo con máscaras sobre un array de objetos, no fila por fila.
+    """
+    column = values.astype(object)  # float de Python
+    rows = kinds == KINDS.index(int)
+    if rows.any():
+        column[rows] = values[rows].astype(np.int64).astype(object)
+    rows = kinds == KINDS.index(np.float64)
+    if rows.any():
+        column[rows] = list(values[rows])  # Escalares np.float64
+    if optional:
+        column[np.isnan(values)] = None
+    return column.tolist()
+
+def _restore_creatures(table):
+    """Crea las Creature de la tabla sin pasar por __init__ (no cuenta ids ni nacimientos).
+
+    Las columnas se convierten a listas de una vez y cada criatura recibe todos sus
+    atributos en una sola actualización de su __dict__.
+    """
+    columns = {}
+    for column, name in enumerate(FLOAT_FIELDS):
+        columns[name] = _float_column(table[name], table["kinds"][:, column], name in OPTIONAL_FIELDS)
+    for name in INT_FIELDS + BOOL_FIELDS:
+        columns[name] = table[name].tolist()
+    colors = [tuple(color) for color in table["colors"].tolist()]
+    columns["parent_color"] = [colors[family] for family in table["family"].tolist()]
+    columns["personality"] = [PERSONALITIES[code] for code in table["personality"].tolist()]
+    columns["target_x"], columns["target_y"] = columns["x"], columns["y"]
+    names = list(columns)
+    creatures = []
+    new = Creature.__new__
+    for values in zip(*columns.values()):
+        creature = new(Creature)
+        state = creature.__dict__
+        state.update(zip(names, values))
+        state["energy"] = 100
+        state["event_times"] = []
+        creatures.append(creature)
+    return creatures
+
+def _stats_state():
+    # families, alive_families y family_traits tienen las mismas claves en el mismo orden
+    colors = list(stats.families)
+    carnivores, personalities = zip(*stats.family_traits.values()) if colors else ((), ())
+    codes = {name: code for code, name in enumerate(PERSONALITIES)}
+    header = {"born": stats.born, "dead": stats.dead, "meals": stats.meals}
+    arrays = {
+        "family_colors": _colour_table(colors),
+        "family_counts": np.fromiter(stats.families.values(), dtype=np.int64, count=len(colors)),
+        "family_alive": np.fromiter(stats.alive_families.values(), dtype=np.int64, count=len(colors)),
+        "family_carnivore": np.array(carnivores, dtype=np.bool_),
+        "family_personality": np.array([codes[name] for name in personalities], dtype=np.int8),
+    }
+    for field in TOP_K_FIELDS:
+        # En el orden interno del montículo, para que las próximas actualizaciones den lo mismo
+        arrays[field] = np.array([-entry[1] for entry in getattr(stats, field)._heap], dtype=np.int64)
+    return header, arrays
+
+def _restore_stats(header, arrays, creatures_by_id):
+    stats.reset()
+    stats.born, stats.dead, stats.meals = header["born"], header["dead"], header["meals"]
+    colors = list(map(tuple, arrays["family_colors"].tolist()))
+    stats.families.update(dict(zip(colors, arrays["family_counts"].tolist())))
+    stats.alive_families.update(dict(zip(colors, arrays["family_alive"].tolist())))
+    personalities = [PERSONALITIES[code] for code in arrays["family_personality"].tolist()]
+    stats.family_traits = dict(zip(colors, zip(arrays["family_carnivore"].tolist(), personalities)))
+    for field in TOP_K_FIELDS:
+        top = getattr(stats, field)
+        for creature_id in arrays[field].tolist():
+            creature = creatures_by_id[creature_id]
+            entry = [getattr(creature, "food_eaten_total" if field == "food_eaten" else field), -creature_id, creature]
+            top._heap.append(entry)
+            top._entries[creature_id] = entry
+
+def save_checkpoint(filename, population, food_sources, food_regime, run, dead_archive=(), events=None):
+    """Guarda el estado completo de la corrida en `filename` (.npz).
+
+    `run` es un diccionario con lo que no está en los objetos del mundo: "seed",
+    "backend", "params", "last_food_time", "born", "dead_creatures",
+    "dead_in_population" y "population_curve". La escritura es atómica: si se
+    interrumpe, queda el punto de control anterior. `events` es la cola del modo por
+    eventos (events.EventScheduler), si la corrida lo usa.
+    """
+    arrays = {}
+
+    def add(prefix, values):
+        for name, value in values.items():
+            arrays[f"{prefix}.{name}"] = value
+
+    # Criaturas referenciadas: población (motor de objetos), archivo de muertas y récords de stats
+    arrays_backend = isinstance(population, ArrayPopulation)
+    creatures, roles, seen = [], [], set()
+    groups = [(ARCHIVE, dead_archive)] if arrays_backend else [(POPULATION, population), (ARCHIVE, dead_archive)]
+    groups.append((STATS_ONLY, [entry[2] for field in TOP_K_FIELDS for entry in getattr(stats, field)._heap]))
+    for role, group in groups:
+        for creature in group:
+            if role != STATS_ONLY or creature.id not in seen:
+                creatures.append(creature)
+                roles.append(role)
+                seen.add(creature.id)
+    with _gc_paused():
+        add("creatures", _creature_table(creatures, roles))
+        stats_header, stats_arrays = _stats_state()
+    if arrays_backend:
+        add("arrays", population.columns())
+        arrays["arrays.colors"] = _colour_table(population.colors)
+
+    food_header, food_arrays = food_sources.state()
+    add("food", food_arrays)
+    random_version, random_state, gauss_next = random.getstate()
+    arrays["random.state"] = np.array(random_state, dtype=np.uint32)
+    random_header, random_arrays = sim_random.state()
+    add("sim_random", random_arrays)
+    add("trajectory", trajectories.state())
+    add("stats", stats_arrays)
+    arrays["run.population_curve"] = np.array(run["population_curve"], dtype=np.int64)
+    events_header = None
+    if events is not None:
+        events_header, events_arrays = events.state()
+        add("events", events_arrays)
+
+    header = {
+        "version": FORMAT_VERSION,
+        "tick": sim_clock.tick,
+        "unique_id": Creature.unique_id,
+        "food_regime": food_regime.state,
+        "food": food_header,
+        "capacity": population.capacity if arrays_backend else None,
+        "random": {"version": random_version, "gauss_next": gauss_next},
+        "sim_random": random_header,
+        "trajectory": {"policy": trajectories.policy, "length": trajectories.length,
+                       "stride": trajectories.stride, "sample_every": trajectories.sample_every},
+        "stats": stats_header,
+        "events": events_header,
+        "run": {key: value for key, value in run.items() if key != "population_curve"},
+    }
+    arrays["header"] = np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8)
+
+    temporary = f"{filename}.tmp"
+    with open(temporary, "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(temporary, filename)
+
+def load_checkpoint(filename, branch=None):
+    """Carga un punto de control y restaura los singletons de la corrida.
+
+    Devuelve un diccionario con "population" (lista de Creature o ArrayPopulation),
+    "food_sources", "food_regime", "dead_archive", "events" (EventScheduler o None) y
+    "run" (el mismo de `save_checkpoint`). Con `branch` se vuelve a sembrar `random` y
+    `sim_random` con esa semilla: la rama sigue desde el mismo mundo con otro azar.
+    """
+    with np.load(filename, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    header = json.loads(arrays.pop("header").tobytes().decode("utf-8"))
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"Versión de punto de control no soportada: {header['version']}")
+    with _gc_paused():
+        return _restore_run(header, arrays, branch)
+
+def _restore_run(header, arrays, branch):
+    def group(prefix):
+        return {name[len(prefix) + 1:]: value for name, value in arrays.items() if name.startswith(prefix + ".")}
+
+    table = group("creatures")
+    creatures = _restore_creatures(table)
+    role = table["role"]
+    population = [creatures[row] for row in np.flatnonzero(role == POPULATION)]
+    dead_archive = [creatures[row] for row in np.flatnonzero(role == ARCHIVE)]
+    creatures_by_id = dict(zip(table["id"].tolist(), creatures))
+    if header["capacity"] is not None:
+        columns = group("arrays")
+        colors = [tuple(color) for color in columns.pop("colors").tolist()]
+        population = ArrayPopulation.from_columns(columns, colors, capacity=header["capacity"])
+
+    food_sources = FoodField.restore(header["food"], group("food"))
+    food_regime = FoodRegime()
+    food_regime.state = header["food_regime"]
+
+    sim_clock.tick = header["tick"]
+    Creature.unique_id = header["unique_id"]
+    random.setstate((header["random"]["version"], tuple(arrays["random.state"].tolist()), header["random"]["gauss_next"]))
+    sim_random.restore(header["sim_random"], group("sim_random"))
+    trajectories.configure(**header["trajectory"])
+    trajectories.restore(**group("trajectory"))
+    _restore_stats(header["stats"], group("stats"), creatures_by_id)
+    events = None
+    if header.get("events") is not None:
+        alive_by_id = None if header["capacity"] is not None else {creature.id: creature for creature in population}
+        events = EventScheduler.restore(header["events"], group("events"), alive_by_id)
+    if branch is not None:
+        random.seed(branch)
+        sim_random.seed(branch)
+
+    run = header["run"]
+    run["population_curve"] = arrays["run.population_curve"].tolist()
+    return {
+        "population": population,
+        "food_sources": food_sources,
+        "food_regime": food_regime,
+        "dead_archive": dead_archive,
+        "events": events,
+        "run": run,
+    }
@@ -1,6 +1,4 @@
 # config.py
-import pygame
-import numpy as np
 
 # Stochastic parameters
 MOVEMENT_KAPPA = 2.0  # Directional persistence (higher = more straight)
@@ -13,25 +11,64 @@ FOOD_REGIME_TRANSITIONS = [
 ]
 
 # Parámetros generales
-GRID_SIZE = 20
+GRID_SIZE = 20  # Lado del mundo en celdas (puede ser de 1000 x 1000 o más)
+FOOD_CHUNK_SIZE = 32  # Lado en celdas de los bloques de la grilla de comida; solo se guardan los bloques con comida
 MAX_FOOD = 20
 TIME_TO_LIVE = 5  # Tiempo límite sin comer antes de morir
 REPRODUCTION_THRESHOLD = 3
 POPULATION_SIZE = 10
 GENERATIONS = 10
-CELL_SIZE = 50  # Tamaño de cada celda en la ventana gráfica
-SCREEN_SIZE = GRID_SIZE * CELL_SIZE
+CELL_SIZE = 50  # Tamaño máximo de cada celda en la ventana gráfica al empezar (la cámara acerca y aleja)
+MAX_SCREEN_SIZE = 1000  # Lado máximo de la ventana en píxeles
+SCREEN_SIZE = min(GRID_SIZE * CELL_SIZE, MAX_SCREEN_SIZE)  # La ventana no crece con el mundo
+MIN_ZOOM = 0.05  # Píxeles por celda con la cámara lo más alejada posible
+MAX_ZOOM = 100  # Píxeles por celda con la cámara lo más cerca posible
+PAN_STEP = 0.1  # Fracción de la ventana que se desplaza la cámara con cada tecla
+ZOOM_STEP = 1.25  # Factor de zoom por paso de la rueda del mouse o de las teclas + y -
 NEW_FOOD_INTERVAL = 500  # 5000 ms = 5 segundos
+DIRTY_RECT_LIMIT = 600  # Con más zonas cambiadas por cuadro se envía toda la ventana
+LABEL_MAX_POPULATION = 300  # Con más criaturas vivas no se dibujan los IDs
+LABEL_MIN_CELL_SIZE = 20  # Con celdas más chicas (en píxeles) no se dibujan los IDs
+COMPACTION_RATIO = 0.25  # Fracción de muertos en la lista de población que dispara la compactación
+TICKS_PER_SECOND = 2  # Ticks de simulación por segundo de tiempo simulado (a velocidad 1)
+SIM_SPEED = 1.0  # Multiplicador de TICKS_PER_SECOND en la ventana; None corre tan rápido como se pueda
+DISPLAY_FPS = 30  # Cuadros por segundo de la ventana, independientes de los ticks
+ANALYSIS_FIT_SAMPLE = 5000  # Máximo de tiempos de supervivencia usados en el ajuste Weibull
+LIVE_STATS = False  # Mostrar nacimientos, muertes y familias vivas durante la corrida
+
+# Trayectorias guardadas para el análisis (ver trajectory.py)
+TRAJECTORY_POLICY = "sample"  # "off", "ring", "stride" o "sample"
+TRAJECTORY_LENGTH = 500  # Pasos que guarda el buffer circular de cada criatura ("ring")
+TRAJECTORY_STRIDE = 10  # Se guarda uno de cada n pasos ("stride")
+TRAJECTORY_SAMPLE_EVERY = 10  # Se sigue una de cada n criaturas, empezando por la primera ("sample")
+
+# Perfilado del bucle principal (ver profiler.py)
+PROFILE = False  # Medir tiempos por fase y contadores en cada tick
+PROFILE_OVERLAY = False  # Dibujar los tiempos del último tick sobre la simulación
+PROFILE_OUTPUT = "profile.csv"  # Serie temporal por tick (.csv o .json)
+
+# Resumen narrado por un modelo de lenguaje (ver GPT.py); la clave se toma de la variable de entorno LLM_API_KEY
+LLM_ENDPOINT = "https://openrouter.ai/api/v1/chat/completions"  # Cualquier API compatible con OpenAI (LLM_ENDPOINT en el entorno)
+LLM_MODEL = "meta-llama/llama-3.1-70b-instruct:free"
+LLM_TIMEOUT = (5, 60)  # Segundos para conectar y de espera máxima entre fragmentos de la respuesta
+LLM_CACHE_DIR = ".summary_cache"  # Respuestas guardadas por hash del resumen estadístico
+LLM_TOP_FAMILIES = 5  # Familias más numerosas incluidas en el resumen
+
+# Parámetros iniciales por defecto (los mismos que ajusta la pantalla de configuración)
+DEFAULT_PARAMS = {
+    "population_size": 10,
+    "carnivore_percentage": 20,
+    "initial_food": 20,
+    "size_min": 10,
+    "size_max": 35,
+    "speed_min": 1,  # Enteros: create_population sortea la velocidad con random.randint
+    "speed_max": 4,
+    "save_csv": True
+}
 
 # Colores
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)  # Color para los caníbales
-
-# Inicializar pygame
-pygame.init()
-font = pygame.font.Font(None, 25)  # Fuente para dibujar los números
-font_large = pygame.font.Font(None, 30)  # Fuente más grande para las estadísticas
-font_huge = pygame.font.Font(None, 50)  # Fuente más grande para las estadísticas
 dead_creatures = 0
\ No newline at end of file
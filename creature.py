@@ -1,9 +1,15 @@
 # creature.py
 import random
-import time
 import math
 import numpy as np
-from config import MOVEMENT_KAPPA, DEATH_SHAPE, DEATH_SCALE, BASE_REPRODUCTION_RATE,GRID_SIZE, TIME_TO_LIVE, REPRODUCTION_THRESHOLD
+from config import MOVEMENT_KAPPA, BASE_REPRODUCTION_RATE,GRID_SIZE, TIME_TO_LIVE, REPRODUCTION_THRESHOLD
+from sim_clock import sim_clock
+from spatial_grid import SpatialGrid
+from sim_random import sim_random
+from survival import weibull_hazard, HAZARD_STEP
+from trajectory import trajectories
+from stats_tracker import stats
+from world_summary import WorldSummary
 
 class Creature:
     unique_id = 0  # Variable de clase para asignar IDs únicos a las criaturas
@@ -15,8 +21,8 @@ class Creature:
         self.food_eaten = 0
         self.food_eaten_total = 0
         self.reproductions = 0
-        self.birth_time = time.time()
-        self.eat_time = time.time()
+        self.birth_time = sim_clock.now()
+        self.eat_time = sim_clock.now()
         self.death_time = None
         self.time_alive = 0
         self.alive = True
@@ -32,24 +38,29 @@ class Creature:
         self.prev_y = self.y
         self.personality = personality 
         self.prev_angle = None  # For correlated random walk
-        self.movement_history = []  # For analysis
         self.event_times = []  # For analysis
+        stats.on_birth(self)
         
     def random_color(self):
         """Genera un color aleatorio para la criatura."""
         return (random.randint(50, 255), random.randint(50, 255), random.randint(50, 255))
 
-    def move(self, food_sources, population):
-        """Mueve la criatura hacia la comida más cercana o hacia otra criatura si es caníbal. Las presas huyen de los caníbales cercanos."""
+    def move(self, food_sources, population, creature_grid=None, world=None):
+        """Mueve la criatura hacia la comida más cercana o hacia otra criatura si es caníbal. Las presas huyen de los caníbales cercanos.
+
+        `food_sources` es el FoodField del mundo, `creature_grid` un SpatialGrid con las criaturas
+        vivas del tick y `world` el WorldSummary del tick; si no se pasan se construyen en el momento.
+        """
         if not self.alive:
             return
+        if creature_grid is None:
+            creature_grid = SpatialGrid.from_objects(c for c in population if c.alive)
 
         if self.is_carnivore:
             # Si es caníbal, busca la criatura más cercana que no sea de su familia
-            other_creatures = [c for c in population if c.alive and c.parent_color != self.parent_color]
-            if other_creatures:
-                nearest_prey = min(other_creatures, key=lambda c: self._distance_to(c))
-                if self.personality == "egoista" or (self.personality == "conservadora" and self._evaluate_resources(food_sources, population)) or (self.personality == "neutral" and random.choice([True,False])):
+            nearest_prey, _ = creature_grid.nearest(self.x, self.y, lambda c: c.parent_color != self.parent_color)
+            if nearest_prey is not None:
+                if self.personality == "egoista" or (self.personality == "conservadora" and self._evaluate_resources(food_sources, population, world)) or (self.personality == "neutral" and sim_random.random() < 0.5):
                     self.stochastic_move_towards(nearest_prey.x, nearest_prey.y)
                 else:
                     self.stochastic_random_move()
@@ -57,42 +68,32 @@ class Creature:
                 self.stochastic_random_move()
         else:
             # Si no es caníbal, verifica si hay caníbales cerca para huir de ellos
-            nearby_carnivores = [c for c in population if c.is_carnivore and c.alive and c.parent_color != self.parent_color]
-            if nearby_carnivores:
-                nearest_carnivore = min(nearby_carnivores, key=lambda c: self._distance_to(c))
-                distance_to_carnivore = self._distance_to(nearest_carnivore)
-                
+            nearest_carnivore, _ = creature_grid.nearest(self.x, self.y, lambda c: c.is_carnivore and c.parent_color != self.parent_color, max_distance=5)  # Ajusta este valor según el rango de detección
+            if nearest_carnivore is not None:
                 # Si el caníbal está lo suficientemente cerca, la criatura huye en dirección opuesta
-                if distance_to_carnivore < 5:  # Ajusta este valor según el rango de detección
-                    self.move_away_from(nearest_carnivore.x, nearest_carnivore.y)
-                else:
-                    # Si no hay un caníbal cerca, busca la comida más cercana
-                    if food_sources:
-                        if self.personality == "egoista" or (self.personality == "conservadora" and self._evaluate_resources(food_sources, population)) or (self.personality == "neutral" and random.choice([True,False])):
-                            nearest_food = min(food_sources, key=lambda f: self._distance_to(f))
-                            self.stochastic_move_towards(nearest_food.x, nearest_food.y)
-                        else:
-                            self.stochastic_random_move()
-                    else:
-                        self.stochastic_random_move()
-            else:
-                # Si no hay caníbales cerca, busca la comida más cercana
-                if food_sources:
-                        if self.personality == "egoista" or (self.personality == "conservadora" and self._evaluate_resources(food_sources, population)) or (self.personality == "neutral" and random.choice([True,False])):
-                            nearest_food = min(food_sources, key=lambda f: self._distance_to(f))
-                            self.stochastic_move_towards(nearest_food.x, nearest_food.y)
-                        else:
-                            self.stochastic_random_move()
+                self.move_away_from(nearest_carnivore.x, nearest_carnivore.y)
+            elif food_sources:
+                # Si no hay un caníbal cerca, busca la comida más cercana
+                if self.personality == "egoista" or (self.personality == "conservadora" and self._evaluate_resources(food_sources, population, world)) or (self.personality == "neutral" and sim_random.random() < 0.5):
+                    food_x, food_y, _ = food_sources.nearest(self.x, self.y)
+                    self.stochastic_move_towards(food_x, food_y)
                 else:
                     self.stochastic_random_move()
-        self.movement_history.append((self.x, self.y, time.time()))
-        
+            else:
+                self.stochastic_random_move()
+        trajectories.record(self.id, self.x, self.y, sim_clock.now())
+
+    @property
+    def movement_history(self):
+        """Pasos guardados de la criatura como array (n, 3) de (x, y, t); ver trajectory.py."""
+        return trajectories.get(self.id)
+
     def stochastic_move_towards(self, target_x, target_y):
         direction = np.arctan2(target_y - self.y, target_x - self.x)
         self._move_with_persistence(direction)
 
     def stochastic_random_move(self):
-        random_direction = np.random.uniform(0, 2*np.pi)
+        random_direction = sim_random.uniform(0, 2*np.pi)
         self._move_with_persistence(random_direction)
 
     def _move_with_persistence(self, target_direction):
@@ -102,10 +103,10 @@ class Creature:
             self.prev_angle = target_direction
         
         # Generate new angle with directional persistence
-        angle = np.random.vonmises(self.prev_angle, MOVEMENT_KAPPA)
+        angle = sim_random.vonmises(self.prev_angle, MOVEMENT_KAPPA)
         
         # Ensure minimum step size of at least 1 unit
-        step_size = max(1, np.random.exponential(scale=self.speed))
+        step_size = max(1, sim_random.exponential(self.speed))
         
         # Calculate new position
         new_x = self.x + step_size * np.cos(angle)
@@ -121,23 +122,28 @@ class Creature:
         # Ensure we always move at least 1 unit (alternative approach)
         if int(self.x) == int(self.prev_x) and int(self.y) == int(self.prev_y):
             # Force minimal movement in random direction
-            self.x += random.choice([-1, 0, 1])
-            self.y += random.choice([-1, 0, 1])
+            self.x += sim_random.choice((-1, 0, 1))
+            self.y += sim_random.choice((-1, 0, 1))
             self.x = self.x % GRID_SIZE
             self.y = self.y % GRID_SIZE
         
         self.prev_x, self.prev_y = self.x, self.y
          
-    def _evaluate_resources(self, food_sources, population):
-        """Evalúa los recursos en el entorno considerando el tipo de criatura."""
+    def _evaluate_resources(self, food_sources, population, world=None):
+        """Evalúa los recursos en el entorno considerando el tipo de criatura.
+
+        Los conteos salen de `world` (WorldSummary del tick); sin él se recorre la población.
+        """
+        if world is None:
+            world = WorldSummary((c for c in population if c.alive), food_sources)
         if not self.is_carnivore:
             # Herbívoro: cuenta comida y otros herbívoros cercanos
-            nearby_food = len(food_sources)
-            nearby_herbivores = sum(1 for creature in population if not creature.is_carnivore and creature.alive and creature.parent_color == self.parent_color)
+            nearby_food = world.food()
+            nearby_herbivores = world.family_herbivores[self.parent_color]
             return nearby_food > nearby_herbivores
         else:
             # Carnívoro: cuenta presas (herbívoros) cercanos
-            nearby_prey = sum(1 for creature in population if not creature.is_carnivore and creature.alive)
+            nearby_prey = world.herbivores
             return nearby_prey > 2  # Sigue cazando solo si hay más de dos presas
         
     def _distance_to(self, obj):
@@ -185,15 +191,18 @@ class Creature:
     def eat(self):
         """Acción de comer si encuentra comida."""
         self.food_eaten += 1
-        self.eat_time = time.time()
+        self.eat_time = sim_clock.now()
+        stats.on_meal(self)
 
     def eat_prey(self, prey):
         """Acción de comer otra criatura si es caníbal."""
         self.food_eaten += 1
-        self.eat_time = time.time()
+        self.eat_time = sim_clock.now()
         prey.alive = False
-        prey.death_time = time.time()
+        prey.death_time = sim_clock.now()
         prey.time_alive = prey.death_time - prey.birth_time
+        stats.on_meal(self)
+        stats.on_death(prey)
 
     def can_reproduce(self):
         """Verifica si la criatura puede reproducirse."""
@@ -204,18 +213,20 @@ class Creature:
         self.reproductions += 1
         self.food_eaten_total += self.food_eaten
         self.food_eaten = 0
+        stats.on_reproduction(self)
         return Creature(self.parent_color, speed=self.speed, size=self.size, is_carnivore=self.is_carnivore, personality=self.personality)
 
     def update(self):
-        """Weibull survival model"""
+        """Weibull survival model para una sola criatura (simulate_generation usa survival.survival_step)"""
         if not self.alive:
             return False
             
-        t = time.time() - self.eat_time
-        hazard = (DEATH_SHAPE/DEATH_SCALE) * (t/DEATH_SCALE)**(DEATH_SHAPE-1)
-        if random.random() < hazard * 0.1:  # Discrete approximation
+        t = sim_clock.now() - self.eat_time
+        hazard = weibull_hazard(t)
+        if sim_random.random() < hazard * HAZARD_STEP:  # Discrete approximation
             self.alive = False
-            self.death_time = time.time()
+            self.death_time = sim_clock.now()
             self.time_alive = self.death_time - self.birth_time
+            stats.on_death(self)
             return True
         return False
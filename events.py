@@ -0,0 +1,159 @@
+# events.py
+"""Modo por eventos: muertes, llegadas de comida y cambios de régimen en un montículo (heapq).
+
+En el modo por ticks cada tick sortea una Bernoulli de supervivencia por criatura viva,
+una transición del régimen de comida y la comida nueva. En el modo por eventos cada
+sorteo se hace una vez por evento y el evento queda programado para su tick:
+
+- La muerte de cada criatura se sortea del modelo Weibull (survival.death_delays) al
+  nacer y se vuelve a sortear cada vez que come; las entradas viejas se descartan al
+  salir del montículo.
+- El régimen de comida dura una cantidad geométrica de ticks con la probabilidad de
+  cambio de su fila de FOOD_REGIME_TRANSITIONS.
+- La comida llega de a una unidad como un proceso de Poisson con la tasa media del
+  régimen actual; al cambiar el régimen se vuelve a sortear la próxima llegada.
+
+Las criaturas se siguen moviendo en cada tick, así que no se saltean ticks mientras
+haya criaturas vivas; lo que deja de costar por tick es la supervivencia de toda la
+población (ahora O(muertes · log N)), el régimen y la comida.
+"""
+import heapq
+import math
+
+import numpy as np
+
+from config import NEW_FOOD_INTERVAL, TICKS_PER_SECOND
+from sim_random import sim_random
+from survival import death_delays
+
+# Tipos de evento; dentro de un mismo tick se atienden en este orden
+REGIME, FOOD, DEATH = range(3)
+
+class EventScheduler:
+    """Cola de eventos de una corrida, ordenada por (tick, tipo, orden de llegada)."""
+
+    def __init__(self):
+        self._heap = []
+        self._sequence = 0
+        self.death_ticks = {}  # id de criatura -> tick de su muerte vigente
+        self.regime_tick = None  # Tick del próximo cambio de régimen (None si el régimen no cambia)
+        self.food_time = None  # Próxima llegada de comida, en ticks (tiempo continuo)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _push(self, tick, kind, payload=None):
+        self._sequence += 1
+        heapq.heappush(self._heap, (tick, kind, self._sequence, payload))
+
+    def start(self, food_regime, creatures, tick):
+        """Programa el primer cambio de régimen, la primera comida y la muerte de `creatures`."""
+        self._schedule_regime(food_regime, tick - 1)
+        self._schedule_food(food_regime, tick)
+        self.schedule_deaths(creatures, tick)
+
+    def _schedule_regime(self, food_regime, tick):
+        probability = food_regime.transition_matrix[food_regime.state][1 - food_regime.state]
+        if probability <= 0:
+            self.regime_tick = None
+            return
+        # Cantidad de ticks hasta el primer éxito de una Bernoulli por tick (soporte 1, 2, ...)
+        self.regime_tick = tick + int(sim_random.generator.geometric(probability))
+        self._push(self.regime_tick, REGIME)
+
+    @staticmethod
+    def food_rate(food_regime):
+        """Unidades de comida por tick del régimen actual (la misma media que el modo por ticks)."""
+        interval = max(1, math.ceil(NEW_FOOD_INTERVAL * TICKS_PER_SECOND / 1000))
+        return food_regime.FOOD_AMOUNTS[food_regime.state] / interval
+
+    def _schedule_food(self, food_regime, time):
+        rate = self.food_rate(food_regime)
+        if rate <= 0:
+            self.food_time = None
+            return
+        self.food_time = time + sim_random.exponential(1 / rate)
+        self._push(math.ceil(self.food_time), FOOD, self.food_time)
+
+    def begin_tick(self, tick, food_regime, food_sources):
+        """Aplica los cambios de régimen y agrega la comida que llega en `tick`. Devuelve las unidades agregadas."""
+        arrivals = 0
+        heap = self._heap
+        while heap and heap[0][0] <= tick and heap[0][1] != DEATH:
+            _, kind, _, payload = heapq.heappop(heap)
+            if kind == REGIME:
+                food_regime.state = 1 - food_regime.state
+                self._schedule_regime(food_regime, tick)
+                self._schedule_food(food_regime, tick - 1)  # La tasa nueva rige para todo el tick
+            elif payload == self.food_time:
+                arrivals += 1
+                self._schedule_food(food_regime, payload)
+        food_sources.spawn(arrivals)
+        return arrivals
+
+    def _push_death(self, creature_id, death_time, tick, creature):
+        # Quien come o nace en `tick` no puede morir en el mismo tick (el riesgo es 0 sin tiempo sin comer)
+        death_tick = max(math.ceil(death_time * TICKS_PER_SECOND), tick + 1)
+        self.death_ticks[creature_id] = death_tick
+        self._push(death_tick, DEATH, (creature_id, creature))
+
+    def schedule_death(self, creature, tick):
+        """(Re)programa la muerte de la criatura a partir de su última comida (`eat_time`)."""
+        self._push_death(creature.id, creature.eat_time + float(death_delays(sim_random.exponential(1.0))), tick, creature)
+
+    def schedule_deaths(self, creatures, tick):
+        """Igual que `schedule_death` para varias criaturas, con un solo sorteo vectorizado."""
+        creatures = [creature for creature in creatures if creature.alive]
+        delays = death_delays(sim_random.generator.standard_exponential(len(creatures)))
+        for creature, delay in zip(creatures, delays.tolist()):
+            self._push_death(creature.id, creature.eat_time + delay, tick, creature)
+
+    def schedule_many(self, creature_ids, eat_time, tick):
+        """Reprograma las muertes por id (motor de arrays) para criaturas que comieron en `eat_time`."""
+        creature_ids = np.asarray(creature_ids).tolist()
+        delays = death_delays(sim_random.generator.standard_exponential(len(creature_ids)))
+        for creature_id, delay in zip(creature_ids, delays.tolist()):
+            self._push_death(creature_id, eat_time + delay, tick, None)
+
+    def end_tick(self, tick):
+        """Muertes vigentes programadas hasta `tick`, como (id, criatura o None) ordenadas por id.
+
+        Las criaturas que ya murieron (por ejemplo, cazadas) pueden aparecer: las descarta quien llama.
+        """
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= tick:
+            entry_tick, kind, _, payload = heapq.heappop(heap)
+            if kind == DEATH and self.death_ticks.get(payload[0]) == entry_tick:
+                del self.death_ticks[payload[0]]
+                due.append(payload)
+        due.sort(key=lambda entry: entry[0])
+        return due
+
+    def state(self):
+        """Estado para checkpoint.py: (encabezado JSON, arrays)."""
+        header = {"regime_tick": self.regime_tick, "food_time": self.food_time}
+        arrays = {
+            "ids": np.fromiter(self.death_ticks.keys(), dtype=np.int64, count=len(self.death_ticks)),
+            "ticks": np.fromiter(self.death_ticks.values(), dtype=np.int64, count=len(self.death_ticks)),
+        }
+        return header, arrays
+
+    @classmethod
+    def restore(cls, header, arrays, creatures_by_id=None):
+        """Cola a partir de `state`. Con `creatures_by_id` (motor de objetos) se omiten las criaturas que ya no están."""
+        scheduler = cls()
+        scheduler.regime_tick, scheduler.food_time = header["regime_tick"], header["food_time"]
+        if scheduler.regime_tick is not None:
+            scheduler._push(scheduler.regime_tick, REGIME)
+        if scheduler.food_time is not None:
+            scheduler._push(math.ceil(scheduler.food_time), FOOD, scheduler.food_time)
+        for creature_id, tick in zip(arrays["ids"].tolist(), arrays["ticks"].tolist()):
+            creature = None
+            if creatures_by_id is not None:
+                creature = creatures_by_id.get(creature_id)
+                if creature is None:
+                    continue
+            scheduler.death_ticks[creature_id] = tick
+            scheduler._push(tick, DEATH, (creature_id, creature))
+        return scheduler
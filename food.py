@@ -1,8 +1,196 @@
 # food.py
-import random
-from config import GRID_SIZE
+import math
 
-class Food:
-    def __init__(self):
-        self.x = random.randint(0, GRID_SIZE - 1)
-        self.y = random.randint(0, GRID_SIZE - 1)
\ No newline at end of file
+import numpy as np
+from config import GRID_SIZE, FOOD_CHUNK_SIZE
+from sim_random import sim_random
+from profiler import profiler
+
+class FoodField:
+    """Comida del mundo guardada como cantidad de alimento por celda.
+
+    La comida siempre aparece en coordenadas enteras, así que una grilla de conteos
+    alcanza para representarla: comer y agregar comida son O(1) y las búsquedas
+    solo revisan las celdas alrededor de la criatura. La grilla está dividida en bloques
+    de `chunk_size` x `chunk_size` celdas y solo se guardan los bloques que tienen comida,
+    así la memoria depende de la comida y no del tamaño del mundo.
+    """
+
+    def __init__(self, width=None, height=None, chunk_size=FOOD_CHUNK_SIZE):
+        self.width = GRID_SIZE if width is None else width
+        self.height = GRID_SIZE if height is None else height
+        self.chunk_size = chunk_size
+        self.chunks = {}  # (bx, by) -> conteos del bloque (int32); los bloques vacíos se descartan
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def _chunk(self, bx, by):
+        """Bloque (bx, by), creándolo vacío si todavía no existe."""
+        chunk = self.chunks.get((bx, by))
+        if chunk is None:
+            size = self.chunk_size
+            shape = (min(size, self.width - bx * size), min(size, self.height - by * size))
+            chunk = self.chunks[bx, by] = np.zeros(shape, dtype=np.int32)
+        return chunk
+
+    def _add(self, xs, ys, amounts):
+        """Suma `amounts` a las celdas (xs[i], ys[i]) (pueden repetirse), bloque por bloque."""
+        size = self.chunk_size
+        xs, ys = np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64)
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=np.int32), xs.shape)
+        bx, by = xs // size, ys // size
+        key = bx * ((self.height + size - 1) // size) + by
+        order = np.argsort(key, kind="stable")
+        starts = np.flatnonzero(np.r_[True, key[order][1:] != key[order][:-1]])
+        for start, stop in zip(starts.tolist(), np.r_[starts[1:], len(order)].tolist()):
+            rows = order[start:stop]
+            block = (int(bx[rows[0]]), int(by[rows[0]]))
+            chunk = self._chunk(*block)
+            np.add.at(chunk, (xs[rows] - block[0] * size, ys[rows] - block[1] * size), amounts[rows])
+            if not chunk.any():
+                del self.chunks[block]
+        self.total += int(amounts.sum())
+
+    def spawn(self, amount):
+        """Agrega `amount` unidades de comida en celdas aleatorias."""
+        if amount <= 0:
+            return
+        xs = sim_random.generator.integers(0, self.width, amount)
+        ys = sim_random.generator.integers(0, self.height, amount)
+        self._add(xs, ys, 1)
+
+    def consume(self, x, y):
+        """Quita una unidad de comida de la celda (x, y)."""
+        block = (x // self.chunk_size, y // self.chunk_size)
+        chunk = self.chunks[block]
+        chunk[x - block[0] * self.chunk_size, y - block[1] * self.chunk_size] -= 1
+        self.total -= 1
+        if not chunk.any():
+            del self.chunks[block]
+
+    def consume_many(self, xs, ys, amounts):
+        """Quita `amounts` unidades de cada celda (xs[i], ys[i]); las celdas no se repiten."""
+        if len(xs):
+            self._add(xs, ys, -np.asarray(amounts))
+
+    def cells(self):
+        """Celdas con comida: arrays (xs, ys, cantidad), ordenadas por x y después por y."""
+        if not self.chunks:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+        size = self.chunk_size
+        xs, ys, counts = [], [], []
+        for (bx, by), chunk in self.chunks.items():
+            cx, cy = np.nonzero(chunk)
+            xs.append(cx + bx * size)
+            ys.append(cy + by * size)
+            counts.append(chunk[cx, cy])
+        xs, ys, counts = np.concatenate(xs), np.concatenate(ys), np.concatenate(counts)
+        if len(self.chunks) > 1:
+            # El mismo orden que tendría una sola grilla: el de los vecinos en los empates
+            order = np.lexsort((ys, xs))
+            xs, ys, counts = xs[order], ys[order], counts[order]
+        return xs, ys, counts
+
+    def state(self):
+        """Estado para checkpoint.py: (encabezado JSON, arrays con las celdas ocupadas)."""
+        xs, ys, counts = self.cells()
+        return {"width": self.width, "height": self.height}, {"x": xs, "y": ys, "counts": counts}
+
+    @classmethod
+    def restore(cls, header, arrays):
+        food = cls(header["width"], header["height"])
+        if len(arrays["x"]):
+            food._add(arrays["x"], arrays["y"], arrays["counts"])
+        return food
+
+    def _window(self, low_x, high_x, low_y, high_y):
+        """Conteos del rectángulo [low_x, high_x] x [low_y, high_y], o None si no toca ningún bloque.
+
+        Si el rectángulo cae en un solo bloque se devuelve una vista del bloque.
+        """
+        size = self.chunk_size
+        first_x, last_x, first_y, last_y = low_x // size, high_x // size, low_y // size, high_y // size
+        if first_x == last_x and first_y == last_y:
+            chunk = self.chunks.get((first_x, first_y))
+            if chunk is None:
+                return None
+            return chunk[low_x - first_x * size:high_x - first_x * size + 1, low_y - first_y * size:high_y - first_y * size + 1]
+        if (last_x - first_x + 1) * (last_y - first_y + 1) <= len(self.chunks):
+            blocks = ((bx, by) for bx in range(first_x, last_x + 1) for by in range(first_y, last_y + 1) if (bx, by) in self.chunks)
+        else:
+            blocks = (block for block in self.chunks if first_x <= block[0] <= last_x and first_y <= block[1] <= last_y)
+        window = None
+        for bx, by in blocks:
+            if window is None:
+                window = np.zeros((high_x - low_x + 1, high_y - low_y + 1), dtype=np.int32)
+            chunk = self.chunks[bx, by]
+            ox, oy = bx * size, by * size
+            x0, x1 = max(low_x, ox), min(high_x, ox + chunk.shape[0] - 1)
+            y0, y1 = max(low_y, oy), min(high_y, oy + chunk.shape[1] - 1)
+            window[x0 - low_x:x1 - low_x + 1, y0 - low_y:y1 - low_y + 1] = chunk[x0 - ox:x1 - ox + 1, y0 - oy:y1 - oy + 1]
+        return window
+
+    def _candidates(self, x, y, radius):
+        """Celdas con comida dentro del cuadrado de lado 2 * radius centrado en (x, y)."""
+        low_x, high_x = max(int(np.floor(x - radius)), 0), min(int(np.ceil(x + radius)), self.width - 1)
+        low_y, high_y = max(int(np.floor(y - radius)), 0), min(int(np.ceil(y + radius)), self.height - 1)
+        window = None if low_x > high_x or low_y > high_y else self._window(low_x, high_x, low_y, high_y)
+        if window is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+        xs, ys = np.nonzero(window)
+        xs, ys = xs + low_x, ys + low_y
+        return xs, ys, np.sqrt((xs - x) ** 2 + (ys - y) ** 2)
+
+    def nearest(self, x, y):
+        """Comida más cercana a (x, y) como (fx, fy, distancia), o None si no hay comida.
+
+        Busca en cuadrados que duplican su tamaño hasta encontrar comida que ninguna celda
+        fuera del cuadrado pueda mejorar, empezando por la distancia media a la comida más
+        cercana si estuviera repartida al azar. Cuando el cuadrado ya es más grande que todos
+        los bloques con comida juntos, se revisan directamente todas las celdas con comida.
+        """
+        if self.total == 0:
+            return None
+        radius = max(1, int(math.sqrt(self.width * self.height / self.total) / 2))
+        while True:
+            scan_all = (2 * radius + 1) ** 2 > len(self.chunks) * self.chunk_size ** 2
+            if scan_all:
+                xs, ys, _ = self.cells()
+                distance = np.sqrt((xs - x) ** 2 + (ys - y) ** 2)
+            else:
+                xs, ys, distance = self._candidates(x, y, radius)
+            profiler.count("food_scanned", len(distance))
+            profiler.count("distance_computations", len(distance))
+            covers_world = scan_all or radius >= max(self.width, self.height)
+            if len(distance) and (distance.min() <= radius or covers_world):
+                best = int(np.argmin(distance))
+                return int(xs[best]), int(ys[best]), float(distance[best])
+            if covers_world:
+                return None
+            radius *= 2
+
+    def find_within(self, x, y, radius):
+        """Primera celda con comida a distancia <= `radius` de (x, y) como (fx, fy), o None."""
+        # El radio de alcance es de pocas celdas: un recorrido directo es más barato que NumPy.
+        low_x, high_x = max(math.floor(x - radius), 0), min(math.ceil(x + radius), self.width - 1)
+        low_y, high_y = max(math.floor(y - radius), 0), min(math.ceil(y + radius), self.height - 1)
+        counts = self._window(low_x, high_x, low_y, high_y)
+        scanned = 0
+        if counts is not None:
+            for i in range(high_x - low_x + 1):
+                for j in range(high_y - low_y + 1):
+                    if counts[i, j]:
+                        scanned += 1
+                        if math.sqrt((i + low_x - x) ** 2 + (j + low_y - y) ** 2) <= radius:
+                            self._count(scanned)
+                            return i + low_x, j + low_y
+        self._count(scanned)
+        return None
+
+    @staticmethod
+    def _count(scanned):
+        if profiler.enabled:
+            profiler.count("food_scanned", scanned)
+            profiler.count("distance_computations", scanned)
@@ -0,0 +1,229 @@
+# headless.py
+"""Simulación sin pygame ni pantalla, tan rápida como lo permita la CPU.
+
+Uso: python headless.py --ticks 1000 --seed 42 --population-size 50
+     python headless.py --ticks 5000 --checkpoint mundo.npz --checkpoint-every 500
+     python headless.py --ticks 8000 --resume mundo.npz --branch 7
+"""
+import argparse
+import json
+import random
+
+from config import DEFAULT_PARAMS, NEW_FOOD_INTERVAL, TRAJECTORY_POLICY
+from creature import Creature
+from food_regime import FoodRegime
+from population_arrays import ArrayPopulation
+from sim_clock import sim_clock
+from sim_random import sim_random
+from trajectory import trajectories, POLICIES
+from profiler import profiler
+from stats_tracker import stats
+from checkpoint import save_checkpoint, load_checkpoint
+from events import EventScheduler
+from simulation import create_population, create_food, add_food, simulate_generation, reproduce, count_alive_carnivores, needs_compaction, compact_population
+
+BACKENDS = ("objects", "arrays")
+
+def simulate(params=None, ticks=1000, seed=None, keep_creatures=False, backend="objects", export=None, trajectory=TRAJECTORY_POLICY,
+             checkpoint=None, checkpoint_every=0, resume=None, branch=None, events=False):
+    """Corre una simulación completa sin interfaz gráfica y devuelve un resumen.
+
+    `params` tiene la misma forma que el diccionario de `show_initial_screen`; las claves
+    faltantes toman los valores de `DEFAULT_PARAMS`. La simulación termina con las mismas
+    condiciones que la versión gráfica o al llegar a `ticks`.
+
+    `backend` elige el motor: "objects" (lista de Creature, igual que la versión gráfica)
+    o "arrays" (ArrayPopulation, vectorizado con NumPy).
+
+    `export` es un destino con `extend` (por ejemplo utils.CreatureCsvStream) que recibe
+    las criaturas muertas a medida que se compacta la población y las sobrevivientes al
+    final; no se cierra aquí. Sin `keep_creatures` las criaturas muertas no se retienen.
+
+    `trajectory` es la política de retención de trayectorias (ver trajectory.py); los
+    pasos quedan en `trajectory.trajectories` hasta la próxima corrida.
+
+    Con `checkpoint` se guarda el estado completo en ese archivo cada `checkpoint_every`
+    ticks (ver checkpoint.py). `resume` continúa desde un punto de control hasta el tick
+    `ticks`, con los parámetros, el motor y la semilla guardados (se ignoran los
+    argumentos); con `branch` la continuación usa esa semilla en lugar de la original.
+
+    Con `events` las muertes, la comida y el régimen salen de una cola de eventos
+    (events.py) en lugar de sortearse en cada tick. Las corridas son estadísticamente
+    equivalentes pero no iguales a las del modo por ticks con la misma semilla.
+    """
+    if resume is not None:
+        state = load_checkpoint(resume, branch=branch)
+        run = state["run"]
+        params, seed, backend = run["params"], run["seed"], run["backend"]
+        population, food_sources, food_regime = state["population"], state["food_sources"], state["food_regime"]
+        dead_archive = state["dead_archive"] if keep_creatures else []
+        last_food_time = run["last_food_time"]
+        born, dead_creatures, dead_in_population = run["born"], run["dead_creatures"], run["dead_in_population"]
+        population_curve = run["population_curve"]
+        scheduler = state["events"]
+    else:
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido: {backend}")
+        params = {**DEFAULT_PARAMS, **(params or {})}
+        # Una sola semilla por corrida: inicializa `random` (población inicial) y el generador de NumPy
+        random.seed(seed)
+        sim_random.seed(seed)
+        Creature.unique_id = 0
+        sim_clock.reset()
+        trajectories.configure(trajectory)
+        stats.reset()
+
+        population = create_population(params["population_size"], params)
+        if backend == "arrays":
+            population = ArrayPopulation.from_creatures(population)
+        born = len(population)
+        dead_archive = []
+        food_sources = create_food(params["initial_food"])
+        food_regime = FoodRegime()
+        last_food_time = sim_clock.now()
+        dead_creatures = 0
+        dead_in_population = 0
+        population_curve = []
+        scheduler = None
+        if events:
+            scheduler = EventScheduler()
+            scheduler.start(food_regime, population, sim_clock.tick)
+
+    def alive_carnivores():
+        if backend == "arrays":
+            return population.count_alive_carnivores()
+        return count_alive_carnivores(population)
+
+    while sim_clock.tick < ticks and (len(food_sources) > 0 or alive_carnivores() > 0) and len(population) > dead_in_population:
+        profiler.start_tick()
+        if scheduler is not None:
+            scheduler.begin_tick(sim_clock.tick, food_regime, food_sources)
+        else:
+            food_regime.update()
+            profiler.lap("food_regime")
+            if (sim_clock.now() - last_food_time) * 1000 >= NEW_FOOD_INTERVAL:
+                add_food(food_sources, amount=food_regime.get_food_amount())
+                last_food_time = sim_clock.now()
+        profiler.lap("add_food")
+
+        if backend == "arrays":
+            deaths = population.step(food_sources, scheduler)
+            profiler.mark()
+            new_population = population.reproduce()
+        else:
+            deaths = simulate_generation(population, food_sources, scheduler)
+            profiler.mark()
+            new_population = reproduce(population)
+            population.extend(new_population)
+        born += len(new_population)
+        if scheduler is not None:
+            scheduler.schedule_deaths(new_population, sim_clock.tick)
+        profiler.lap("reproduce")
+        dead_creatures += deaths
+        dead_in_population += deaths
+        if needs_compaction(population, dead_in_population):
+            dead = []
+            if backend == "arrays":
+                population.compact(dead)
+            else:
+                compact_population(population, dead)
+            if export is not None:
+                export.extend(dead)
+            if keep_creatures:
+                dead_archive.extend(dead)
+            dead_in_population = 0
+        profiler.lap("compaction")
+
+        profiler.end_tick(sim_clock.tick)
+        sim_clock.advance()
+        population_curve.append(len(population) - dead_in_population)
+        if checkpoint is not None and checkpoint_every and sim_clock.tick % checkpoint_every == 0:
+            save_checkpoint(checkpoint, population, food_sources, food_regime, {
+                "seed": seed, "backend": backend, "params": params, "last_food_time": last_food_time,
+                "born": born, "dead_creatures": dead_creatures, "dead_in_population": dead_in_population,
+                "population_curve": population_curve,
+            }, dead_archive, scheduler)
+
+    if export is not None:
+        export.extend(population)
+
+    carnivores = alive_carnivores()
+    summary = {
+        "seed": seed,
+        "ticks": sim_clock.tick,
+        "born": born,
+        "dead": dead_creatures,
+        "alive": len(population) - dead_in_population,
+        "alive_carnivores": carnivores,
+        "alive_herbivores": len(population) - dead_in_population - carnivores,
+        "food": len(food_sources),
+        "food_regime": food_regime.state,
+        "population_curve": population_curve,
+    }
+    if branch is not None:
+        summary["branch"] = branch
+    if keep_creatures:
+        summary["creatures"] = sorted(dead_archive + list(population), key=lambda c: c.id)
+    return summary
+
+def add_param_arguments(parser):
+    """Agrega al parser las opciones de los parámetros de `show_initial_screen`."""
+    parser.add_argument("--population-size", type=int, default=DEFAULT_PARAMS["population_size"])
+    parser.add_argument("--carnivore-percentage", type=int, default=DEFAULT_PARAMS["carnivore_percentage"])
+    parser.add_argument("--initial-food", type=int, default=DEFAULT_PARAMS["initial_food"])
+    parser.add_argument("--size-min", type=int, default=DEFAULT_PARAMS["size_min"])
+    parser.add_argument("--size-max", type=int, default=DEFAULT_PARAMS["size_max"])
+    parser.add_argument("--speed-min", type=int, default=DEFAULT_PARAMS["speed_min"])
+    parser.add_argument("--speed-max", type=int, default=DEFAULT_PARAMS["speed_max"])
+
+def params_from_args(args):
+    """Diccionario de parámetros (sin "save_csv") a partir de las opciones de `add_param_arguments`."""
+    return {
+        "population_size": args.population_size,
+        "carnivore_percentage": args.carnivore_percentage,
+        "initial_food": args.initial_food,
+        "size_min": args.size_min,
+        "size_max": args.size_max,
+        "speed_min": args.speed_min,
+        "speed_max": args.speed_max,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación de sociedades sin interfaz gráfica.")
+    parser.add_argument("--ticks", type=int, default=1000, help="Cantidad máxima de ticks a simular.")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla para reproducir la corrida.")
+    add_param_arguments(parser)
+    parser.add_argument("--backend", choices=BACKENDS, default="objects", help="Motor de población.")
+    parser.add_argument("--trajectories", choices=POLICIES, default=TRAJECTORY_POLICY, help="Política de retención de trayectorias.")
+    parser.add_argument("--csv", default=None, help="Archivo CSV donde agregar las criaturas de la corrida.")
+    parser.add_argument("--profile", default=None, help="Archivo .json o .csv donde guardar los tiempos por fase de cada tick.")
+    parser.add_argument("--curve", action="store_true", help="Incluir la población viva por tick en la salida.")
+    parser.add_argument("--events", action="store_true", help="Programar muertes, comida y régimen en una cola de eventos.")
+    parser.add_argument("--checkpoint", default=None, help="Archivo .npz donde guardar puntos de control.")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="Ticks entre puntos de control.")
+    parser.add_argument("--resume", default=None, help="Punto de control desde el que continuar la corrida.")
+    parser.add_argument("--branch", type=int, default=None, help="Semilla de la rama al continuar desde --resume.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    params = params_from_args(args)
+    params["save_csv"] = args.csv is not None
+    resume_args = {"events": args.events, "checkpoint": args.checkpoint, "checkpoint_every": args.checkpoint_every, "resume": args.resume, "branch": args.branch}
+    if args.profile is not None:
+        profiler.enabled = True
+        profiler.reset()
+    if args.csv is not None:
+        from utils import CreatureCsvStream, CSV_FIELDS, next_run_index
+        with CreatureCsvStream(args.csv, CSV_FIELDS, mode="a", id_prefix=next_run_index()) as export:
+            summary = simulate(params, ticks=args.ticks, seed=args.seed, backend=args.backend, export=export, trajectory=args.trajectories, **resume_args)
+    else:
+        summary = simulate(params, ticks=args.ticks, seed=args.seed, backend=args.backend, trajectory=args.trajectories, **resume_args)
+    if args.profile is not None:
+        profiler.export(args.profile)
+    if not args.curve:
+        summary.pop("population_curve")
+    print(json.dumps(summary))
+
+if __name__ == "__main__":
+    main()
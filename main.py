@@ -1,14 +1,16 @@
-import math
-import random
+import numpy as np
 import pygame
 
-from config import MAX_FOOD, NEW_FOOD_INTERVAL, SCREEN_SIZE
-from creature import Creature
-from food import Food
-from ui import show_initial_screen, show_statistics, visualize_population
-from utils import generate_tmp_csv, save_to_csv
-from food_regime import FoodRegime
-from analysis import analyze_creature_data
+from config import SCREEN_SIZE, DISPLAY_FPS, SIM_SPEED, PROFILE, PROFILE_OVERLAY, PROFILE_OUTPUT, LIVE_STATS
+from simulation import create_population, create_food
+from sim_thread import SimulationThread
+from ui import Camera, show_initial_screen, show_statistics, visualize_snapshot, reset_render_cache
+from utils import open_run_exports
+from sim_clock import sim_clock
+from sim_random import sim_random
+from trajectory import trajectories
+from profiler import profiler
+from stats_tracker import stats
 
 dead_creatures = 0
 
@@ -16,72 +18,12 @@ def add_to_dead_creatures():
     global dead_creatures
     dead_creatures += 1
 
-def create_population(size, params):
-    """Crea una población inicial con los parámetros configurados."""
-    population = []
-    carnivores = 0
-    for _ in range(size):
-        csize = random.randint(params["size_min"], params["size_max"])
-        speed = random.randint(params["speed_min"], params["speed_max"])
-        if carnivores < size * params["carnivore_percentage"] / 100:
-            is_carnivore = True
-            carnivores += 1
-        else:
-            is_carnivore = False
-        population.append(Creature(size=csize, speed=speed, is_carnivore=is_carnivore, personality=random.choice(["egoista", "conservadora", "neutral"])))
-    return population
-
-def create_food(amount=MAX_FOOD):
-    """Crea una lista de comida aleatoria."""
-    return [Food() for _ in range(amount)]
-
-def add_food(food_sources, amount=2):
-    """Agrega nueva comida a la lista."""
-    food_sources.extend(create_food(amount))
-
-def simulate_generation(population, food_sources):
-    """Simula una generación completa."""
-    global dead_creatures
-    for creature in population:
-        if not creature.alive:
-            continue
-        creature.move(food_sources, population)
-        for food in food_sources:
-            direction_x = creature.x - food.x
-            direction_y = creature.y - food.y
-            distance = math.sqrt(direction_x ** 2 + direction_y ** 2)
-            if not creature.is_carnivore and distance <= creature.size/15: #creature.x == food.x and creature.y == food.y:
-                creature.eat()
-                food_sources.remove(food)
-                break
-        for prey in population:
-            if creature.is_carnivore and prey.alive and prey.parent_color != creature.parent_color:
-                direction_x = creature.x - prey.x
-                direction_y = creature.y - prey.y
-                distance = math.sqrt(direction_x ** 2 + direction_y ** 2) 
-                if creature.x == prey.x and distance <= creature.size/15: #creature.y == prey.y:
-                    creature.eat_prey(prey)
-                    dead_creatures += 1
-                    break
-        if creature.update(): # Si la criatura en cuestión murió (update retornó True) aumento el contador.
-            dead_creatures += 1
-        
-def reproduce(population):
-    """Selecciona criaturas para reproducirse y crear la próxima generación."""
-    new_population = []
-    for creature in population:
-        if creature.alive and creature.can_reproduce():
-            new_population.append(creature.reproduce())  # Hijo 1
-            new_population.append(creature.reproduce())  # Hijo 2
-    return new_population
-            
-def count_alive_carnivores(population):
-    carnivores = 0
-    for creature in population:
-        if creature.is_carnivore and creature.alive:
-            carnivores += 1
-    return carnivores
-            
+def report_analysis(future):
+    """Avisa cuando el análisis en segundo plano terminó de escribir las figuras."""
+    if future.exception() is not None:
+        print(f"Error en el análisis: {future.exception()}")
+    else:
+        print(f"Análisis listo: {', '.join(future.result())}")
 
 def run_simulation():
     while(True):
@@ -90,51 +32,73 @@ def run_simulation():
         POPULATION_SIZE = params["population_size"]
         screen = pygame.display.set_mode((SCREEN_SIZE, SCREEN_SIZE))
         pygame.display.set_caption("Simulación de Criaturas")
+        reset_render_cache()
 
-        population = create_population(POPULATION_SIZE, params)
-        all_creatures = population.copy()  # Mantener un registro de todas las criaturas
+        # Los singletons de la corrida se reinician antes de crear criaturas y comida: los fundadores
+        # nacen en el tiempo 0 de esta corrida y sus nacimientos quedan en `stats`
+        sim_clock.reset()
+        sim_random.seed()
+        trajectories.reset()
+        profiler.enabled = PROFILE
+        profiler.reset()
+        stats.reset()
+        population = create_population(POPULATION_SIZE, params)  # Solo criaturas vivas (y las muertas aún sin compactar)
+        exports = open_run_exports(params["save_csv"])  # Los CSV se escriben a medida que mueren las criaturas
         food_sources = create_food(params["initial_food"])
         clock = pygame.time.Clock()
-        last_food_time = pygame.time.get_ticks()
         global dead_creatures
         dead_creatures = 0
-        stop = False
-        food_regime = FoodRegime()  # Initialize food regime
-        
-        # Simular generación
-        while (len(food_sources) > 0 or count_alive_carnivores(population) > 0) and len(population) > dead_creatures and not stop:
+
+        # La simulación avanza en su propio hilo; este bucle atiende eventos y dibuja
+        engine = SimulationThread(population, food_sources, exports)
+        engine.start()
+        camera = Camera()  # Vista sobre el mundo; se mueve con el mouse y el teclado
+        drawn = drawn_view = None
+        while engine.is_alive() or drawn is not engine.snapshot:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    engine.stop()
+                    engine.join()
+                    for export in exports:
+                        export.close()
                     pygame.quit()
                     return
+                elif camera.handle_event(event):
+                    pass
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     print("Simulación detenida por el usuario.")
-                    stop = True
-            # Update food regime stochastically
-            food_regime.update()
-            
-            if pygame.time.get_ticks() - last_food_time > NEW_FOOD_INTERVAL:
-                add_food(food_sources, amount=food_regime.get_food_amount())
-                last_food_time = pygame.time.get_ticks()
+                    engine.stop()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_UP and engine.speed:
+                    engine.speed *= 2  # Más rápido
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_DOWN and engine.speed:
+                    engine.speed /= 2  # Más lento
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+                    engine.speed = None if engine.speed else SIM_SPEED  # Máxima velocidad / velocidad normal
+            snapshot = engine.snapshot
+            if snapshot is not None and (snapshot is not drawn or camera.view() != drawn_view):
+                overlay = (profiler.overlay_lines() if PROFILE_OVERLAY else []) + (list(snapshot.statistics) if LIVE_STATS else [])
+                visualize_snapshot(screen, snapshot, overlay, camera)
+                drawn, drawn_view = snapshot, camera.view()
+            clock.tick(DISPLAY_FPS)
+        engine.join()
+        dead_creatures = engine.dead_creatures
 
-            simulate_generation(population, food_sources)
-            visualize_population(screen, population, food_sources)
-            clock.tick(2)
+        # Exportar las criaturas que quedaron en la población y cerrar los CSV
+        for export in exports:
+            export.extend(population)
+            export.close()
+        if profiler.enabled:
+            profiler.export(PROFILE_OUTPUT)
 
-            # Agregar nuevas criaturas a `all_creatures`
-            new_population = reproduce(population)
-            all_creatures.extend(new_population)  # Agregar nuevas criaturas a la lista completa
-            population.extend(new_population)
-
-        if params["save_csv"]:
-            save_to_csv(all_creatures)
-        
-        generate_tmp_csv(all_creatures)
-        # Perform stochastic analysis
-        analyze_creature_data(all_creatures)
+        # Perform stochastic analysis (en otro proceso: las figuras aparecen cuando terminan)
+        from analysis import start_analysis, survival_times
+        analysis = start_analysis(np.concatenate([engine.survival_times, survival_times(population)]))
+        analysis.add_done_callback(report_analysis)
         
         # Mostrar estadísticas de todas las criaturas
-        show_statistics(screen, all_creatures)
+        show_statistics(screen, stats)
 
 if __name__ == "__main__":
+    from multiprocessing import freeze_support
+    freeze_support()  # Ejecutable de PyInstaller (main.spec): los procesos del análisis no vuelven a abrir la ventana
     run_simulation()
@@ -0,0 +1,441 @@
+# population_arrays.py
+"""Población guardada como estructura de arrays (SoA) de NumPy.
+
+Cada atributo de las criaturas vive en un array contiguo y un tick completo
+(movimiento, bordes, comida, depredación y supervivencia) se calcula con
+operaciones vectorizadas. Las criaturas se exponen como `CreatureView`, una
+fachada con la misma interfaz que `Creature`, para que `ui.py` y `utils.py`
+funcionen sin cambios.
+
+A diferencia de `simulate_generation`, que mueve y evalúa a las criaturas una
+por una, aquí todas actúan sobre el estado del comienzo del tick (actualización
+por fases). Si varios herbívoros alcanzan la misma celda de comida, comen primero
+los de fila más baja, hasta agotar las unidades de la celda.
+"""
+import numpy as np
+
+from config import MOVEMENT_KAPPA, GRID_SIZE, REPRODUCTION_THRESHOLD
+from creature import Creature
+from sim_clock import sim_clock
+from sim_random import sim_random
+from spatial_grid import PointGrid
+from survival import survival_step
+from trajectory import trajectories
+from profiler import profiler
+
+PERSONALITIES = ["egoista", "conservadora", "neutral"]
+EGOISTA, CONSERVADORA, NEUTRAL = range(3)
+FLEE_DISTANCE = 5  # Distancia a la que un herbívoro huye de un carnívoro (igual que Creature.move)
+
+def _first_claims(targets):
+    """Máscara de los elementos que reclaman primero cada objetivo (el resto llega tarde)."""
+    _, first = np.unique(targets, return_index=True)
+    mask = np.zeros(len(targets), dtype=bool)
+    mask[first] = True
+    return mask
+
+def _array_field(name):
+    def getter(self):
+        if self._population is None:
+            return self._detached[name]
+        return getattr(self._population, name)[self._index].item()
+
+    def setter(self, value):
+        if self._population is None:
+            self._detached[name] = value
+        else:
+            getattr(self._population, name)[self._index] = value
+    return property(getter, setter)
+
+def _optional_field(name):
+    """Campo que en Creature puede ser None; en el array se guarda como NaN."""
+    def getter(self):
+        value = self._detached[name] if self._population is None else getattr(self._population, name)[self._index].item()
+        return None if value is None or np.isnan(value) else value
+
+    def setter(self, value):
+        value = np.nan if value is None else value
+        if self._population is None:
+            self._detached[name] = value
+        else:
+            getattr(self._population, name)[self._index] = value
+    return property(getter, setter)
+
+class CreatureView(Creature):
+    """Fachada de una criatura de ArrayPopulation con la misma interfaz que Creature."""
+
+    energy = 100
+
+    def __init__(self, population, index):
+        # No se llama a Creature.__init__: los datos viven en los arrays de la población.
+        self._population = population
+        self._index = index
+        self._detached = None
+        self.event_times = []
+
+    def detach(self):
+        """Copia los valores actuales fuera de los arrays (antes de reutilizar o compactar la fila)."""
+        population, index = self._population, self._index
+        self._detached = {name: getattr(population, name)[index].item() for name in ArrayPopulation.FIELDS}
+        self._detached["parent_color"] = population.colors[self._detached["family"]]
+        self._population = None
+
+    id = _array_field("id")
+    x = _array_field("x")
+    y = _array_field("y")
+    prev_x = _array_field("prev_x")
+    prev_y = _array_field("prev_y")
+    prev_angle = _optional_field("prev_angle")
+    speed = _array_field("speed")
+    size = _array_field("size")
+    is_carnivore = _array_field("is_carnivore")
+    alive = _array_field("alive")
+    food_eaten = _array_field("food_eaten")
+    food_eaten_total = _array_field("food_eaten_total")
+    reproductions = _array_field("reproductions")
+    birth_time = _array_field("birth_time")
+    eat_time = _array_field("eat_time")
+    death_time = _optional_field("death_time")
+    time_alive = _array_field("time_alive")
+
+    @property
+    def personality(self):
+        code = self._detached["personality"] if self._population is None else self._population.personality[self._index]
+        return PERSONALITIES[code]
+
+    @property
+    def parent_color(self):
+        if self._population is None:
+            return self._detached["parent_color"]
+        return self._population.colors[self._population.family[self._index]]
+
+class ArrayPopulation:
+    """Población de criaturas guardada en arrays contiguos de NumPy."""
+
+    FIELDS = {
+        "id": np.int64,
+        "x": np.float64,
+        "y": np.float64,
+        "prev_x": np.float64,
+        "prev_y": np.float64,
+        "prev_angle": np.float64,
+        "speed": np.float64,
+        "size": np.int64,
+        "is_carnivore": np.bool_,
+        "personality": np.int8,
+        "family": np.int32,
+        "alive": np.bool_,
+        "food_eaten": np.int64,
+        "food_eaten_total": np.int64,
+        "reproductions": np.int64,
+        "birth_time": np.float64,
+        "eat_time": np.float64,
+        "death_time": np.float64,
+        "time_alive": np.float64,
+    }
+
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.colors = []  # Color de cada familia (índice = valor de `family`)
+        self._family_index = {}
+        self._views = []  # CreatureView de cada fila, o None hasta que alguien la pide (ver `view`)
+
+    @classmethod
+    def from_creatures(cls, creatures):
+        """Convierte una lista de Creature (por ejemplo de create_population) en arrays."""
+        population = cls(capacity=max(1024, 2 * len(creatures)))
+        population._append({
+            "id": [c.id for c in creatures],
+            "x": [c.x for c in creatures],
+            "y": [c.y for c in creatures],
+            "prev_x": [c.prev_x for c in creatures],
+            "prev_y": [c.prev_y for c in creatures],
+            "prev_angle": [np.nan if c.prev_angle is None else c.prev_angle for c in creatures],
+            "speed": [c.speed for c in creatures],
+            "size": [c.size for c in creatures],
+            "is_carnivore": [c.is_carnivore for c in creatures],
+            "personality": [PERSONALITIES.index(c.personality) for c in creatures],
+            "family": [population._family(c.parent_color) for c in creatures],
+            "alive": [c.alive for c in creatures],
+            "food_eaten": [c.food_eaten for c in creatures],
+            "food_eaten_total": [c.food_eaten_total for c in creatures],
+            "reproductions": [c.reproductions for c in creatures],
+            "birth_time": [c.birth_time for c in creatures],
+            "eat_time": [c.eat_time for c in creatures],
+            "death_time": [np.nan if c.death_time is None else c.death_time for c in creatures],
+            "time_alive": [c.time_alive for c in creatures],
+        })
+        return population
+
+    @classmethod
+    def from_columns(cls, columns, colors, capacity=1024):
+        """Población a partir de arrays campo -> valores (como los de `columns`) y los colores de cada familia."""
+        population = cls(capacity=max(capacity, len(columns["id"])))
+        population.colors = list(colors)
+        population._family_index = {color: index for index, color in enumerate(colors)}
+        population._append(columns)
+        return population
+
+    def columns(self):
+        """Copia de las filas en uso de cada campo, como diccionario campo -> array."""
+        return {name: getattr(self, name)[:self.count].copy() for name in self.FIELDS}
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.creatures)
+
+    def view(self, row):
+        """CreatureView de la fila `row`; se crea la primera vez que se pide y después se reutiliza."""
+        view = self._views[row]
+        if view is None:
+            view = self._views[row] = CreatureView(self, row)
+        return view
+
+    @property
+    def creatures(self):
+        """Una CreatureView por fila (las filas muertas se quitan con compact)."""
+        return [self.view(row) for row in range(self.count)]
+
+    def _family(self, color):
+        if color not in self._family_index:
+            self._family_index[color] = len(self.colors)
+            self.colors.append(color)
+        return self._family_index[color]
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def _append(self, columns):
+        """Agrega filas nuevas a partir de un diccionario campo -> valores y devuelve sus índices.
+
+        Las vistas de las filas nuevas se crean recién cuando se piden.
+        """
+        amount = len(columns["id"])
+        self._grow(self.count + amount)
+        rows = range(self.count, self.count + amount)
+        for name, values in columns.items():
+            getattr(self, name)[self.count:self.count + amount] = values
+        self._views.extend([None] * amount)
+        self.count += amount
+        return rows
+
+    def compact(self, dead_archive):
+        """Quita las filas de criaturas muertas; sus vistas se desacoplan y pasan a `dead_archive`."""
+        alive = self.alive[:self.count]
+        for row in np.flatnonzero(~alive).tolist():
+            view = self.view(row)
+            view.detach()
+            dead_archive.append(view)
+        keep = np.flatnonzero(alive)
+        for name in self.FIELDS:
+            values = getattr(self, name)
+            values[:len(keep)] = values[keep]
+        self._views = [self._views[row] for row in keep.tolist()]
+        for index, view in enumerate(self._views):
+            if view is not None:
+                view._index = index
+        self.count = len(keep)
+
+    def live_indices(self):
+        return np.flatnonzero(self.alive[:self.count])
+
+    def count_alive_carnivores(self):
+        return int(np.count_nonzero(self.alive[:self.count] & self.is_carnivore[:self.count]))
+
+    def _wants_target(self, live, food_count):
+        """Compuerta de personalidad de Creature.move: egoista siempre, conservadora si hay recursos, neutral al azar."""
+        personality = self.personality[live]
+        carnivore = self.is_carnivore[live]
+        family = self.family[live]
+        herbivores = ~carnivore
+        family_herbivores = np.bincount(family[herbivores], minlength=len(self.colors))
+        resources = np.where(carnivore, np.count_nonzero(herbivores) > 2, food_count > family_herbivores[family])
+        coin = sim_random.generator.random(len(live)) < 0.5
+        return (personality == EGOISTA) | ((personality == CONSERVADORA) & resources) | ((personality == NEUTRAL) & coin)
+
+    def step(self, food_sources, events=None):
+        """Simula un tick completo de forma vectorizada. Devuelve la cantidad de criaturas que murieron.
+
+        Con `events` (events.EventScheduler) la supervivencia usa las muertes programadas.
+        """
+        live = self.live_indices()
+        if len(live) == 0:
+            return 0
+        profiler.mark()
+        now = sim_clock.now()
+        x, y = self.x[live], self.y[live]
+        family = self.family[live]
+        carnivore = self.is_carnivore[live]
+        food_cell_x, food_cell_y, food_count = food_sources.cells()
+        food_x, food_y = food_cell_x.astype(np.float64), food_cell_y.astype(np.float64)
+        wants = self._wants_target(live, len(food_sources))
+
+        # Objetivos: presas de otra familia para los carnívoros, comida para los herbívoros
+        target_x, target_y = np.zeros(len(live)), np.zeros(len(live))
+        has_target = np.zeros(len(live), dtype=bool)
+        flee = np.zeros(len(live), dtype=bool)
+
+        grid = PointGrid(x, y, counter="creatures_scanned")
+        hunters = np.flatnonzero(carnivore)
+        prey, _ = grid.nearest(x[hunters], y[hunters], family[hunters], family)
+        chase = (prey >= 0) & wants[hunters]
+        has_target[hunters[chase]] = True
+        target_x[hunters[chase]], target_y[hunters[chase]] = x[prey[chase]], y[prey[chase]]
+
+        grazers = np.flatnonzero(~carnivore)
+        threats = np.flatnonzero(carnivore)
+        threat, _ = PointGrid(x[threats], y[threats], counter="creatures_scanned").nearest(x[grazers], y[grazers], family[grazers], family[threats], max_distance=FLEE_DISTANCE)
+        fleeing = threat >= 0
+        flee[grazers[fleeing]] = True
+        food_grid = PointGrid(food_x, food_y, counter="food_scanned")
+        if len(food_x):
+            seeking = grazers[~fleeing & wants[grazers]]
+            food, _ = food_grid.nearest(x[seeking], y[seeking])
+            has_target[seeking] = True
+            target_x[seeking], target_y[seeking] = food_x[food], food_y[food]
+
+        # Huida: Creature.move_away_from (pasos enteros y límites recortados)
+        runners = np.flatnonzero(flee)
+        if len(runners):
+            threat_index = threats[threat[fleeing]]
+            dx, dy = x[runners] - x[threat_index], y[runners] - y[threat_index]
+            distance = np.sqrt(dx ** 2 + dy ** 2)
+            safe = np.where(distance == 0, 1.0, distance)
+            speed = self.speed[live[runners]]
+            x[runners] = np.clip(x[runners] + np.where(distance != 0, np.trunc(speed * dx / safe), 0), 0, GRID_SIZE - 1)
+            y[runners] = np.clip(y[runners] + np.where(distance != 0, np.trunc(speed * dy / safe), 0), 0, GRID_SIZE - 1)
+
+        # Caminata aleatoria correlacionada: Creature._move_with_persistence
+        walkers = np.flatnonzero(~flee)
+        rows = live[walkers]
+        direction = np.where(has_target[walkers],
+                             np.arctan2(target_y[walkers] - y[walkers], target_x[walkers] - x[walkers]),
+                             sim_random.generator.uniform(0, 2 * np.pi, len(walkers)))
+        prev_angle = self.prev_angle[rows]
+        prev_angle = np.where(np.isnan(prev_angle), direction, prev_angle)
+        angle = prev_angle + sim_random.generator.vonmises(0, MOVEMENT_KAPPA, len(walkers))
+        angle = (angle + np.pi) % (2 * np.pi) - np.pi
+        step_size = np.maximum(1, sim_random.generator.standard_exponential(len(walkers)) * self.speed[rows])
+        new_x = (x[walkers] + step_size * np.cos(angle)) % GRID_SIZE
+        new_y = (y[walkers] + step_size * np.sin(angle)) % GRID_SIZE
+        stuck = (new_x.astype(np.int64) == self.prev_x[rows].astype(np.int64)) & (new_y.astype(np.int64) == self.prev_y[rows].astype(np.int64))
+        nudges = sim_random.generator.integers(-1, 2, size=(2, np.count_nonzero(stuck)))
+        new_x[stuck] = (new_x[stuck] + nudges[0]) % GRID_SIZE
+        new_y[stuck] = (new_y[stuck] + nudges[1]) % GRID_SIZE
+        x[walkers], y[walkers] = new_x, new_y
+        self.prev_angle[rows] = angle
+        self.prev_x[rows], self.prev_y[rows] = new_x, new_y
+        self.x[live], self.y[live] = x, y
+        trajectories.record_many(self.id[live], x, y, now)
+        profiler.lap("movement")
+
+        deaths = 0
+        reach = self.size[live] / 15
+        max_reach = reach.max() * (1 + 1e-9)
+
+        # Herbívoros comen la comida dentro de su alcance
+        if len(food_x):
+            food, distance = food_grid.nearest(x[grazers], y[grazers], max_distance=max_reach)
+            eaters = np.flatnonzero(distance <= reach[grazers])
+            # Cada celda alimenta como máximo a tantos herbívoros como unidades de comida tiene
+            order = np.argsort(food[eaters], kind="stable")
+            eaters, cell = eaters[order], food[eaters][order]
+            fed = np.arange(len(cell)) - np.searchsorted(cell, cell) < food_count[cell]
+            eaters = eaters[fed]
+            self.food_eaten[live[grazers[eaters]]] += 1
+            self.eat_time[live[grazers[eaters]]] = now
+            if events is not None:
+                events.schedule_many(self.id[live[grazers[eaters]]], now, sim_clock.tick)
+            cells, amounts = np.unique(cell[fed], return_counts=True)
+            food_sources.consume_many(food_cell_x[cells], food_cell_y[cells], amounts)
+        profiler.lap("eating")
+
+        # Carnívoros cazan presas de otra familia (misma condición que simulate_generation)
+        if len(hunters):
+            prey, distance = PointGrid(x, y, counter="creatures_scanned").nearest(x[hunters], y[hunters], family[hunters], family, max_distance=max_reach)
+            caught = np.flatnonzero((prey >= 0) & (distance <= reach[hunters]))
+            caught = caught[x[hunters[caught]] == x[prey[caught]]]
+            caught = caught[_first_claims(prey[caught])]
+            victims = live[prey[caught]]
+            self.food_eaten[live[hunters[caught]]] += 1
+            self.eat_time[live[hunters[caught]]] = now
+            if events is not None:
+                events.schedule_many(self.id[live[hunters[caught]]], now, sim_clock.tick)
+            self.alive[victims] = False
+            self.death_time[victims] = now
+            self.time_alive[victims] = now - self.birth_time[victims]
+            deaths += len(victims)
+        profiler.lap("predation")
+
+        # Modelo de supervivencia Weibull (Creature.update)
+        if events is None:
+            live = self.live_indices()
+            died = live[survival_step(self.eat_time[live], now, sim_random.generator.random(len(live)))]
+        else:
+            # Los ids están ordenados: las filas nuevas siempre se agregan al final
+            due = np.array([creature_id for creature_id, _ in events.end_tick(sim_clock.tick)], dtype=np.int64)
+            # Las cazadas pueden seguir programadas aunque ya no estén (compactadas) o estén muertas
+            rows = np.minimum(np.searchsorted(self.id[:self.count], due), max(self.count - 1, 0))
+            died = rows[(self.id[rows] == due) & self.alive[rows]]
+        self.alive[died] = False
+        self.death_time[died] = now
+        self.time_alive[died] = now - self.birth_time[died]
+        deaths += len(died)
+        profiler.lap("survival")
+        profiler.count("deaths", deaths)
+        return deaths
+
+    def reproduce(self):
+        """Equivalente vectorizado de simulation.reproduce: dos hijos por cada criatura que puede reproducirse."""
+        parents = np.flatnonzero(self.alive[:self.count] & (self.food_eaten[:self.count] >= REPRODUCTION_THRESHOLD))
+        if len(parents) == 0:
+            return []
+        self.reproductions[parents] += 2
+        self.food_eaten_total[parents] += self.food_eaten[parents]
+        self.food_eaten[parents] = 0
+
+        origin = np.repeat(parents, 2)
+        amount = len(origin)
+        now = sim_clock.now()
+        x = sim_random.generator.integers(0, GRID_SIZE, amount).astype(np.float64)
+        y = sim_random.generator.integers(0, GRID_SIZE, amount).astype(np.float64)
+        first_id = Creature.unique_id + 1
+        Creature.unique_id += amount
+        profiler.count("births", amount)
+        rows = self._append({
+            "id": np.arange(first_id, first_id + amount),
+            "x": x,
+            "y": y,
+            "prev_x": x,
+            "prev_y": y,
+            "prev_angle": np.full(amount, np.nan),
+            "speed": self.speed[origin],
+            "size": self.size[origin],
+            "is_carnivore": self.is_carnivore[origin],
+            "personality": self.personality[origin],
+            "family": self.family[origin],
+            "alive": np.ones(amount, dtype=bool),
+            "food_eaten": np.zeros(amount, dtype=np.int64),
+            "food_eaten_total": np.zeros(amount, dtype=np.int64),
+            "reproductions": np.zeros(amount, dtype=np.int64),
+            "birth_time": np.full(amount, now),
+            "eat_time": np.full(amount, now),
+            "death_time": np.full(amount, np.nan),
+            "time_alive": np.zeros(amount),
+        })
+        return [self.view(row) for row in rows]
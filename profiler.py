@@ -0,0 +1,91 @@
+# profiler.py
+"""Tiempos por fase y contadores de cada tick de la simulación.
+
+El bucle marca el comienzo del tick con `mark()` y cierra cada fase con `lap(nombre)`,
+que suma el tiempo transcurrido desde la marca anterior. Los contadores (criaturas y
+comida revisadas, distancias calculadas, muertes, nacimientos) se suman con `count`.
+Con el perfilador desactivado (por defecto) cada llamada solo revisa `enabled`.
+
+`end_tick` guarda una fila por tick que se exporta como serie temporal en JSON o CSV.
+"""
+import csv
+import json
+import time
+
+PHASES = ("events", "food_regime", "add_food", "movement", "eating", "predation", "survival",
+          "visualize", "wait", "reproduce", "compaction")
+COUNTERS = ("creatures_scanned", "food_scanned", "distance_computations", "deaths", "births")
+
+class PhaseProfiler:
+    """Acumula tiempos por fase y contadores, y guarda una fila por tick."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """Descarta las filas guardadas y los acumuladores del tick en curso."""
+        self.rows = []
+        self._clear()
+
+    def _clear(self):
+        self._times = dict.fromkeys(PHASES, 0.0)
+        self._counts = dict.fromkeys(COUNTERS, 0)
+        self._tick_start = self._mark = time.perf_counter()
+
+    def mark(self):
+        """Empieza a medir la próxima fase desde ahora."""
+        if self.enabled:
+            self._mark = time.perf_counter()
+
+    def lap(self, phase):
+        """Suma a `phase` el tiempo desde la última marca y marca de nuevo."""
+        if self.enabled:
+            now = time.perf_counter()
+            self._times[phase] = self._times.get(phase, 0.0) + now - self._mark
+            self._mark = now
+
+    def count(self, counter, amount=1):
+        if self.enabled:
+            self._counts[counter] = self._counts.get(counter, 0) + amount
+
+    def start_tick(self):
+        if self.enabled:
+            self._clear()
+
+    def end_tick(self, tick):
+        """Guarda la fila del tick con los tiempos (en segundos) y contadores acumulados."""
+        if not self.enabled:
+            return
+        row = {"tick": tick, "total": time.perf_counter() - self._tick_start}
+        row.update(self._times)
+        row.update(self._counts)
+        self.rows.append(row)
+        self._clear()
+
+    def overlay_lines(self):
+        """Líneas de texto con el último tick guardado, para dibujar sobre la simulación."""
+        if not self.rows:
+            return []
+        row = self.rows[-1]
+        lines = [f"tick {row['tick']}: {row['total'] * 1000:.1f} ms"]
+        lines += [f"{phase}: {row[phase] * 1000:.2f} ms" for phase in PHASES if row.get(phase)]
+        lines += [f"{counter}: {row[counter]}" for counter in COUNTERS if row.get(counter)]
+        return lines
+
+    def export(self, filename):
+        """Escribe la serie de ticks como JSON (si el nombre termina en .json) o CSV."""
+        if filename.endswith(".json"):
+            with open(filename, "w", encoding="utf-8") as file:
+                json.dump(self.rows, file)
+            return
+        fieldnames = ["tick", "total", *PHASES, *COUNTERS]
+        for row in self.rows:
+            fieldnames += [name for name in row if name not in fieldnames]
+        with open(filename, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames, restval=0)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+# Perfilador compartido por la simulación en curso (desactivado por defecto)
+profiler = PhaseProfiler()
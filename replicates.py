@@ -0,0 +1,113 @@
+# replicates.py
+"""Réplicas Monte Carlo de una configuración en paralelo.
+
+Cada réplica es una corrida de `headless.simulate` con su propia semilla; las semillas
+salen de una `SeedSequence`, así que los flujos aleatorios son independientes y el
+resultado no depende de cuántos procesos se usen.
+
+Con `--resume` cada réplica es una rama de un punto de control (checkpoint.py): todas
+parten del mismo mundo ya calentado y solo cambia la semilla.
+
+Uso: python replicates.py --runs 200 --seed 1 --ticks 500 --workers 8
+     python replicates.py --runs 50 --seed 1 --ticks 3000 --resume mundo.npz
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from headless import simulate, add_param_arguments, params_from_args, BACKENDS
+
+SUMMARY_FIELDS = ("ticks", "born", "dead", "alive", "alive_carnivores", "alive_herbivores", "food")
+
+def replicate_seeds(runs, seed=None):
+    """Semillas independientes para `runs` réplicas derivadas de `seed`."""
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(runs)]
+
+def run_replicate(seed, params=None, ticks=1000, backend="objects", resume=None):
+    """Una réplica: resumen de `simulate` sin criaturas ni trayectorias (o una rama de `resume`)."""
+    if resume is not None:
+        return simulate(ticks=ticks, resume=resume, branch=seed)
+    return simulate(params, ticks=ticks, seed=seed, backend=backend, trajectory="off")
+
+def aggregate(summaries):
+    """Estadísticas de un conjunto de resúmenes de `simulate`, en el orden recibido."""
+    statistics = {}
+    for field in SUMMARY_FIELDS:
+        values = np.array([summary[field] for summary in summaries], dtype=np.float64)
+        statistics[field] = {
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+        }
+
+    # Las corridas terminan en ticks distintos: después del final la población queda fija
+    length = max(len(summary["population_curve"]) for summary in summaries)
+    curves = np.zeros((len(summaries), length))
+    for row, summary in enumerate(summaries):
+        curve = summary["population_curve"]
+        if curve:
+            curves[row, :len(curve)] = curve
+            curves[row, len(curve):] = curve[-1]
+    p05, median, p95 = np.percentile(curves, [5, 50, 95], axis=0)
+    return {
+        "runs": len(summaries),
+        "extinctions": sum(1 for summary in summaries if summary["alive"] == 0),
+        "statistics": statistics,
+        "population_curve": {
+            "mean": curves.mean(axis=0).tolist(),
+            "std": curves.std(axis=0).tolist(),
+            "p05": p05.tolist(),
+            "median": median.tolist(),
+            "p95": p95.tolist(),
+            "extinct": (curves == 0).mean(axis=0).tolist(),
+        },
+    }
+
+def run_replicates(params=None, seeds=100, ticks=1000, backend="objects", workers=None, seed=None, resume=None):
+    """Corre las réplicas de `params` y devuelve (resúmenes, agregado).
+
+    `seeds` es una lista de semillas o la cantidad de réplicas (las semillas se derivan de
+    `seed`). `workers` es la cantidad de procesos; con 1 se corre en este proceso. Los
+    resúmenes quedan en el orden de las semillas. Con `resume` las réplicas continúan el
+    punto de control hasta `ticks` (se ignoran `params` y `backend`).
+    """
+    if isinstance(seeds, int):
+        seeds = replicate_seeds(seeds, seed)
+    run = partial(run_replicate, params=params, ticks=ticks, backend=backend, resume=resume)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(seeds) == 1:
+        summaries = [run(s) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            summaries = list(executor.map(run, seeds, chunksize=max(1, len(seeds) // (4 * workers))))
+    return summaries, aggregate(summaries)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Réplicas Monte Carlo de la simulación en paralelo.")
+    parser.add_argument("--runs", type=int, default=100, help="Cantidad de réplicas.")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla de la que se derivan las de cada réplica.")
+    parser.add_argument("--ticks", type=int, default=1000, help="Cantidad máxima de ticks por réplica.")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos a usar (por defecto, todos los núcleos).")
+    add_param_arguments(parser)
+    parser.add_argument("--backend", choices=BACKENDS, default="objects", help="Motor de población.")
+    parser.add_argument("--resume", default=None, help="Punto de control desde el que parte cada réplica.")
+    parser.add_argument("--runs-detail", action="store_true", help="Incluir el resumen de cada réplica en la salida.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    seeds = replicate_seeds(args.runs, args.seed)
+    summaries, result = run_replicates(params_from_args(args), seeds, ticks=args.ticks, backend=args.backend, workers=args.workers, resume=args.resume)
+    result["seed"] = args.seed
+    result["seeds"] = seeds
+    if args.runs_detail:
+        result["summaries"] = summaries
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+# sim_clock.py
+from config import TICKS_PER_SECOND
+
+class SimClock:
+    """Reloj de simulación: el tiempo avanza por ticks y no depende del reloj de pared."""
+
+    def __init__(self, ticks_per_second=TICKS_PER_SECOND):
+        self.ticks_per_second = ticks_per_second
+        self.tick = 0
+
+    def reset(self):
+        """Vuelve el reloj a cero para comenzar una nueva simulación."""
+        self.tick = 0
+
+    def advance(self, ticks=1):
+        """Avanza el reloj la cantidad de ticks indicada."""
+        self.tick += ticks
+
+    def now(self):
+        """Tiempo simulado en segundos (ticks / ticks por segundo)."""
+        return self.tick / self.ticks_per_second
+
+# Reloj compartido por la simulación en curso
+sim_clock = SimClock()
@@ -0,0 +1,103 @@
+# sim_random.py
+"""Números aleatorios de la simulación, con una sola semilla por corrida.
+
+Las llamadas escalares a `np.random` cuestan microsegundos cada una. `SimRandom`
+sortea por adelantado bloques de variables para toda la población (una vez por
+tick con `prepare`) y las entrega de a una desde listas de Python. El motor de
+arrays usa directamente `generator` para sorteos vectorizados.
+"""
+import math
+
+import numpy as np
+
+from config import MOVEMENT_KAPPA
+
+BLOCK_SIZE = 4096  # Tamaño mínimo de cada bloque sorteado
+
+class _Stream:
+    """Bloque de variables ya sorteadas y la posición de la próxima a entregar."""
+
+    __slots__ = ("draw", "values", "cursor")
+
+    def __init__(self, draw):
+        self.draw = draw
+        self.values = []
+        self.cursor = 0
+
+    def reserve(self, amount):
+        available = len(self.values) - self.cursor
+        if available < amount:
+            self.values = self.values[self.cursor:] + self.draw(max(amount - available, BLOCK_SIZE)).tolist()
+            self.cursor = 0
+
+class SimRandom:
+    """Generador de NumPy por simulación con bloques de variables predibujadas."""
+
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reinicia el generador y descarta los bloques sorteados."""
+        self.generator = np.random.default_rng(seed)
+        self._uniform = _Stream(self.generator.random)
+        self._exponential = _Stream(self.generator.standard_exponential)
+        self._vonmises = {}  # kappa -> bloque de desvíos von Mises centrados en 0
+
+    def state(self):
+        """Estado del generador y variables sorteadas sin entregar, como (encabezado JSON, arrays)."""
+        kappas = list(self._vonmises)
+        header = {"bit_generator": self.generator.bit_generator.state, "vonmises": kappas}
+        streams = [self._uniform, self._exponential] + [self._vonmises[kappa] for kappa in kappas]
+        names = ["uniform", "exponential"] + [f"vonmises{i}" for i in range(len(kappas))]
+        arrays = {name: np.array(stream.values[stream.cursor:], dtype=np.float64) for name, stream in zip(names, streams)}
+        return header, arrays
+
+    def restore(self, header, arrays):
+        """Vuelve al estado guardado con `state`; los próximos sorteos son los mismos."""
+        self.seed()
+        self.generator.bit_generator.state = header["bit_generator"]
+        self._uniform.values = arrays["uniform"].tolist()
+        self._exponential.values = arrays["exponential"].tolist()
+        for i, kappa in enumerate(header["vonmises"]):
+            self._vonmises_stream(kappa).values = arrays[f"vonmises{i}"].tolist()
+
+    def _vonmises_stream(self, kappa):
+        stream = self._vonmises.get(kappa)
+        if stream is None:
+            stream = self._vonmises[kappa] = _Stream(lambda size: self.generator.vonmises(0.0, kappa, size))
+        return stream
+
+    def prepare(self, creatures):
+        """Sortea de una vez las variables que puede consumir un tick de `creatures` criaturas."""
+        self._uniform.reserve(4 * creatures)  # moneda, dirección al azar y empujones
+        self._exponential.reserve(creatures)
+        self._vonmises_stream(MOVEMENT_KAPPA).reserve(creatures)
+
+    @staticmethod
+    def _next(stream):
+        if stream.cursor >= len(stream.values):
+            stream.reserve(1)
+        value = stream.values[stream.cursor]
+        stream.cursor += 1
+        return value
+
+    def random(self):
+        """Uniforme en [0, 1)."""
+        return self._next(self._uniform)
+
+    def uniform(self, low, high):
+        return low + (high - low) * self._next(self._uniform)
+
+    def choice(self, options):
+        return options[int(self._next(self._uniform) * len(options))]
+
+    def exponential(self, scale):
+        return scale * self._next(self._exponential)
+
+    def vonmises(self, mu, kappa=MOVEMENT_KAPPA):
+        """Ángulo von Mises centrado en `mu`, normalizado a [-pi, pi) como np.random.vonmises."""
+        angle = mu + self._next(self._vonmises_stream(kappa))
+        return (angle + math.pi) % (2 * math.pi) - math.pi
+
+# Generador compartido por la simulación en curso
+sim_random = SimRandom()
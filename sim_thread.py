@@ -0,0 +1,130 @@
+# sim_thread.py
+"""Simulación en un hilo aparte de la ventana.
+
+`SimulationThread` avanza los ticks (lo más rápido posible o a TICKS_PER_SECOND por un
+multiplicador de velocidad) y publica instantáneas inmutables con lo necesario para
+dibujar. El bucle de pygame dibuja la última instantánea a su propio ritmo: un cuadro
+lento no frena el modelo y avanzar rápido no obliga a dibujar cada tick.
+"""
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+from config import NEW_FOOD_INTERVAL, TICKS_PER_SECOND, DISPLAY_FPS, SIM_SPEED
+from food_regime import FoodRegime
+from profiler import profiler
+from sim_clock import sim_clock
+from stats_tracker import stats
+from simulation import add_food, simulate_generation, reproduce, count_alive_carnivores, needs_compaction, compact_population
+
+# Estado visible de un tick: arrays de solo lectura y tuplas, uno por criatura viva
+Snapshot = namedtuple("Snapshot", ["tick", "time", "ids", "x", "y", "sizes", "colors", "carnivores",
+                                   "food_x", "food_y", "alive", "statistics", "finished"])
+
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+class SimulationThread(threading.Thread):
+    """Corre la simulación de `population` hasta que termina o se llama a `stop`.
+
+    `speed` multiplica TICKS_PER_SECOND; None corre tan rápido como se pueda y se puede
+    cambiar mientras corre. Al compactar la población las criaturas muertas se pasan a
+    `exports` y se descartan; de ellas solo queda su tiempo de supervivencia en
+    `survival_times`, que es lo que necesita el análisis.
+    """
+
+    def __init__(self, population, food_sources, exports=(), speed=SIM_SPEED, publish_interval=1 / DISPLAY_FPS):
+        super().__init__(daemon=True)
+        self.population = population
+        self.food_sources = food_sources
+        self.exports = exports
+        self.speed = speed
+        self.publish_interval = publish_interval
+        self.food_regime = FoodRegime()
+        self.survival_times = array("d")  # Tiempo de vida de cada criatura muerta ya quitada de la población
+        self.dead_creatures = 0
+        self.dead_in_population = 0
+        self.snapshot = None  # Última instantánea publicada (se reemplaza entera, nunca se modifica)
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def running(self):
+        """Mismas condiciones de fin que el bucle de run_simulation."""
+        return ((len(self.food_sources) > 0 or count_alive_carnivores(self.population) > 0)
+                and len(self.population) > self.dead_in_population)
+
+    def run(self):
+        self._last_food_time = sim_clock.now()
+        self._publish(False)
+        published = next_tick = time.perf_counter()
+        while not self._stop_event.is_set() and self.running():
+            self.step()
+            now = time.perf_counter()
+            if now - published >= self.publish_interval:
+                self._publish(False)
+                published = now
+            speed = self.speed
+            if speed:
+                next_tick += 1 / (TICKS_PER_SECOND * speed)
+                wait = next_tick - time.perf_counter()
+                if wait > 0:
+                    self._stop_event.wait(wait)
+                else:
+                    next_tick = time.perf_counter()  # Si el tick tardó de más, no se acumula atraso
+            else:
+                next_tick = now
+        self._publish(True)
+
+    def step(self):
+        """Un tick de la simulación."""
+        profiler.start_tick()
+        self.food_regime.update()
+        profiler.lap("food_regime")
+        if (sim_clock.now() - self._last_food_time) * 1000 >= NEW_FOOD_INTERVAL:
+            add_food(self.food_sources, amount=self.food_regime.get_food_amount())
+            self._last_food_time = sim_clock.now()
+        profiler.lap("add_food")
+
+        deaths = simulate_generation(self.population, self.food_sources)
+        self.dead_creatures += deaths
+        self.dead_in_population += deaths
+        tick = sim_clock.tick
+        sim_clock.advance()
+
+        profiler.mark()
+        self.population.extend(reproduce(self.population))
+        profiler.lap("reproduce")
+        if needs_compaction(self.population, self.dead_in_population):
+            dead = []
+            compact_population(self.population, dead)
+            for export in self.exports:
+                export.extend(dead)
+            self.survival_times.extend(creature.time_alive for creature in dead if creature.death_time is not None)
+            self.dead_in_population = 0
+        profiler.lap("compaction")
+        profiler.end_tick(tick)
+
+    def _publish(self, finished):
+        alive = [creature for creature in self.population if creature.alive]
+        food_x, food_y, _ = self.food_sources.cells()
+        self.snapshot = Snapshot(
+            tick=sim_clock.tick,
+            time=sim_clock.now(),
+            ids=tuple(creature.id for creature in alive),
+            x=_frozen(np.array([creature.x for creature in alive], dtype=np.float64)),
+            y=_frozen(np.array([creature.y for creature in alive], dtype=np.float64)),
+            sizes=tuple(creature.size for creature in alive),
+            colors=tuple(creature.parent_color for creature in alive),
+            carnivores=tuple(creature.is_carnivore for creature in alive),
+            food_x=_frozen(food_x),
+            food_y=_frozen(food_y),
+            alive=len(alive),
+            statistics=tuple(stats.live_lines()),
+            finished=finished,
+        )
@@ -0,0 +1,118 @@
+# simulation.py
+import random
+
+from config import MAX_FOOD, COMPACTION_RATIO
+from creature import Creature
+from food import FoodField
+from spatial_grid import SpatialGrid
+from sim_random import sim_random
+from sim_clock import sim_clock
+from survival import survival_step, apply_deaths
+from profiler import profiler
+from world_summary import WorldSummary
+
+def create_population(size, params):
+    """Crea una población inicial con los parámetros configurados."""
+    population = []
+    carnivores = 0
+    for _ in range(size):
+        csize = random.randint(params["size_min"], params["size_max"])
+        speed = random.randint(params["speed_min"], params["speed_max"])
+        if carnivores < size * params["carnivore_percentage"] / 100:
+            is_carnivore = True
+            carnivores += 1
+        else:
+            is_carnivore = False
+        population.append(Creature(size=csize, speed=speed, is_carnivore=is_carnivore, personality=random.choice(["egoista", "conservadora", "neutral"])))
+    return population
+
+def create_food(amount=MAX_FOOD):
+    """Crea el campo de comida con `amount` unidades en celdas aleatorias."""
+    food_sources = FoodField()
+    food_sources.spawn(amount)
+    return food_sources
+
+def add_food(food_sources, amount=2):
+    """Agrega nueva comida al campo."""
+    food_sources.spawn(amount)
+
+def simulate_generation(population, food_sources, events=None):
+    """Simula una generación completa. Devuelve la cantidad de criaturas que murieron.
+
+    La supervivencia se evalúa al final del tick para toda la población a la vez, o con
+    `events` (events.EventScheduler) se aplican las muertes programadas para este tick y
+    se reprograma la de cada criatura que come.
+    Las búsquedas de criaturas usan un índice por celdas que se arma al comienzo del tick y
+    se actualiza a medida que las criaturas se mueven o mueren; la comida (FoodField) ya
+    está indexada por celda. Los conteos que usan las decisiones (WorldSummary) también se
+    arman una vez por tick y se descuentan con cada presa.
+    """
+    dead_creatures = 0
+    sim_random.prepare(len(population))
+    living = [c for c in population if c.alive]
+    creature_grid = SpatialGrid.from_objects(living)
+    world = WorldSummary(living, food_sources)
+    profiler.mark()
+    for creature in population:
+        if not creature.alive:
+            continue
+        creature.move(food_sources, population, creature_grid, world)
+        creature_grid.move(creature)
+        profiler.lap("movement")
+        if not creature.is_carnivore:
+            food = food_sources.find_within(creature.x, creature.y, creature.size/15)
+            if food is not None:
+                creature.eat()
+                food_sources.consume(*food)
+                if events is not None:
+                    events.schedule_death(creature, sim_clock.tick)
+            profiler.lap("eating")
+        else:
+            prey = creature_grid.find_within(creature.x, creature.y, creature.size/15,
+                                             lambda p: p.parent_color != creature.parent_color and p.x == creature.x)
+            if prey is not None:
+                creature.eat_prey(prey)
+                creature_grid.remove(prey)
+                world.remove(prey)
+                dead_creatures += 1
+                if events is not None:
+                    events.schedule_death(creature, sim_clock.tick)
+            profiler.lap("predation")
+
+    if events is None:
+        # Supervivencia Weibull de todas las criaturas vivas en una sola operación
+        living = [creature for creature in population if creature.alive]
+        died = survival_step([creature.eat_time for creature in living], sim_clock.now(), sim_random.generator.random(len(living)))
+        died = [living[i] for i in died]
+    else:
+        died = [creature for _, creature in events.end_tick(sim_clock.tick) if creature.alive]
+    apply_deaths(died, sim_clock.now())
+    profiler.lap("survival")
+    profiler.count("deaths", dead_creatures + len(died))
+    return dead_creatures + len(died)
+
+def reproduce(population):
+    """Selecciona criaturas para reproducirse y crear la próxima generación."""
+    new_population = []
+    for creature in population:
+        if creature.alive and creature.can_reproduce():
+            new_population.append(creature.reproduce())  # Hijo 1
+            new_population.append(creature.reproduce())  # Hijo 2
+    profiler.count("births", len(new_population))
+    return new_population
+
+def needs_compaction(population, dead_in_population):
+    """Indica si los muertos que siguen en la lista superan COMPACTION_RATIO de su largo."""
+    return dead_in_population > 0 and dead_in_population >= COMPACTION_RATIO * len(population)
+
+def compact_population(population, dead_archive):
+    """Pasa las criaturas muertas de `population` a `dead_archive`, dejando solo las vivas."""
+    dead_archive.extend(creature for creature in population if not creature.alive)
+    population[:] = [creature for creature in population if creature.alive]
+
+def count_alive_carnivores(population):
+    carnivores = 0
+    for creature in population:
+        if creature.is_carnivore and creature.alive:
+            carnivores += 1
+    return carnivores
@@ -0,0 +1,313 @@
+# spatial_grid.py
+"""Índices espaciales por celdas (cell lists) sobre el mundo de GRID_SIZE x GRID_SIZE.
+
+`SpatialGrid` guarda objetos con atributos `x`, `y` (criaturas o comida) y se
+actualiza incrementalmente cuando se mueven, mueren o se comen. `PointGrid` es la
+versión vectorizada para coordenadas en arrays de NumPy (ArrayPopulation).
+
+Las distancias son euclídeas sin envolver los bordes, igual que
+`Creature._distance_to`.
+"""
+import math
+
+import numpy as np
+
+from config import GRID_SIZE
+from profiler import profiler
+
+BRUTE_FORCE_CHUNK = 256  # Filas por bloque al calcular distancias entre todos los pares
+LARGE_WORLD_CELLS = 1 << 16  # En mundos con más celdas, los índices usan celdas con ~1 punto cada una
+
+def auto_cell_size(width, height, points):
+    """Lado de las celdas del índice: 1 en mundos chicos; en mundos grandes, el que deja ~1 punto por celda.
+
+    Así en un mundo grande y poco poblado las búsquedas no recorren anillos de celdas
+    vacías y la memoria del índice depende de la cantidad de puntos, no del mundo.
+    """
+    if width * height <= LARGE_WORLD_CELLS:
+        return 1.0
+    return max(1.0, math.sqrt(width * height / max(points, 1)))
+
+def _ring(cx, cy, ring, cols, rows):
+    """Celdas a distancia de Chebyshev `ring` de (cx, cy) dentro del mundo."""
+    if ring == 0:
+        return [(cx, cy)]
+    cells = []
+    for i in range(cx - ring, cx + ring + 1):
+        if 0 <= i < cols:
+            if cy - ring >= 0:
+                cells.append((i, cy - ring))
+            if cy + ring < rows:
+                cells.append((i, cy + ring))
+    for j in range(cy - ring + 1, cy + ring):
+        if 0 <= j < rows:
+            if cx - ring >= 0:
+                cells.append((cx - ring, j))
+            if cx + ring < cols:
+                cells.append((cx + ring, j))
+    return cells
+
+class SpatialGrid:
+    """Índice de objetos por celda con consultas de vecino más cercano y de radio."""
+
+    def __init__(self, cell_size=1.0, width=None, height=None, counter="creatures_scanned"):
+        width = GRID_SIZE if width is None else width
+        height = GRID_SIZE if height is None else height
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.counter = counter  # Contador del perfilador para los objetos revisados
+        self.cells = {}  # (cx, cy) -> {objeto: None}; el dict conserva el orden de inserción
+        self._cell_of = {}  # objeto -> celda donde está guardado
+
+    @classmethod
+    def from_objects(cls, objects, **kwargs):
+        objects = list(objects)
+        if "cell_size" not in kwargs:
+            kwargs["cell_size"] = auto_cell_size(kwargs.get("width") or GRID_SIZE, kwargs.get("height") or GRID_SIZE, len(objects))
+        grid = cls(**kwargs)
+        for obj in objects:
+            grid.insert(obj)
+        return grid
+
+    def __len__(self):
+        return len(self._cell_of)
+
+    def __contains__(self, obj):
+        return obj in self._cell_of
+
+    def _key(self, x, y):
+        cx = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        cy = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return cx, cy
+
+    def insert(self, obj):
+        key = self._key(obj.x, obj.y)
+        self.cells.setdefault(key, {})[obj] = None
+        self._cell_of[obj] = key
+
+    def remove(self, obj):
+        key = self._cell_of.pop(obj, None)
+        if key is None:
+            return
+        bucket = self.cells[key]
+        del bucket[obj]
+        if not bucket:
+            del self.cells[key]
+
+    def move(self, obj):
+        """Actualiza la celda de un objeto después de cambiar su posición."""
+        old = self._cell_of.get(obj)
+        if old is None:
+            return
+        key = self._key(obj.x, obj.y)
+        if key != old:
+            bucket = self.cells[old]
+            del bucket[obj]
+            if not bucket:
+                del self.cells[old]
+            self.cells.setdefault(key, {})[obj] = None
+            self._cell_of[obj] = key
+
+    def nearest(self, x, y, predicate=None, max_distance=math.inf):
+        """Objeto más cercano a (x, y) que cumple `predicate`, a distancia menor que `max_distance`.
+
+        Devuelve (objeto, distancia) o (None, inf). Recorre anillos de celdas hacia afuera
+        y se detiene cuando ningún anillo restante puede tener un objeto más cercano.
+        """
+        best, best_distance = None, max_distance
+        cx, cy = self._key(x, y)
+        visited = scanned = computed = 0
+        for ring in range(max(self.cols, self.rows)):
+            if (ring - 1) * self.cell_size >= best_distance:
+                break
+            if visited > len(self._cell_of):
+                # Mundo casi vacío: es más barato revisar todos los objetos que seguir con anillos.
+                self._count(scanned, computed)
+                return self._nearest_linear(x, y, predicate, max_distance)
+            for key in _ring(cx, cy, ring, self.cols, self.rows):
+                visited += 1
+                bucket = self.cells.get(key)
+                if not bucket:
+                    continue
+                scanned += len(bucket)
+                for obj in bucket:
+                    if predicate is not None and not predicate(obj):
+                        continue
+                    computed += 1
+                    distance = math.sqrt((x - obj.x) ** 2 + (y - obj.y) ** 2)
+                    if distance < best_distance:
+                        best, best_distance = obj, distance
+        self._count(scanned, computed)
+        return best, (best_distance if best is not None else math.inf)
+
+    def _nearest_linear(self, x, y, predicate, max_distance):
+        best, best_distance = None, max_distance
+        computed = 0
+        for obj in self._cell_of:
+            if predicate is not None and not predicate(obj):
+                continue
+            computed += 1
+            distance = math.sqrt((x - obj.x) ** 2 + (y - obj.y) ** 2)
+            if distance < best_distance:
+                best, best_distance = obj, distance
+        self._count(len(self._cell_of), computed)
+        return best, (best_distance if best is not None else math.inf)
+
+    def find_within(self, x, y, radius, predicate=None):
+        """Primer objeto a distancia <= `radius` de (x, y) que cumple `predicate`, o None."""
+        low_x, low_y = self._key(x - radius, y - radius)
+        high_x, high_y = self._key(x + radius, y + radius)
+        scanned = computed = 0
+        for i in range(low_x, high_x + 1):
+            for j in range(low_y, high_y + 1):
+                bucket = self.cells.get((i, j))
+                if not bucket:
+                    continue
+                scanned += len(bucket)
+                for obj in bucket:
+                    if predicate is not None and not predicate(obj):
+                        continue
+                    computed += 1
+                    if math.sqrt((x - obj.x) ** 2 + (y - obj.y) ** 2) <= radius:
+                        self._count(scanned, computed)
+                        return obj
+        self._count(scanned, computed)
+        return None
+
+    def _count(self, scanned, computed):
+        if profiler.enabled:
+            profiler.count(self.counter, scanned)
+            profiler.count("distance_computations", computed)
+
+def nearest_brute_force(qx, qy, px, py, q_family=None, p_family=None, max_distance=np.inf):
+    """Vecino más cercano calculando todas las distancias por bloques.
+
+    Devuelve (índice, distancia) por consulta; -1 e infinito si no hay candidato a
+    distancia menor que `max_distance`. Con familias se ignoran los pares de la misma familia.
+    """
+    index = np.full(len(qx), -1, dtype=np.int64)
+    distance = np.full(len(qx), np.inf)
+    if len(px) == 0:
+        return index, distance
+    for start in range(0, len(qx), BRUTE_FORCE_CHUNK):
+        stop = start + BRUTE_FORCE_CHUNK
+        d2 = (qx[start:stop, None] - px[None, :]) ** 2 + (qy[start:stop, None] - py[None, :]) ** 2
+        if q_family is not None:
+            d2[q_family[start:stop, None] == p_family[None, :]] = np.inf
+        best = np.argmin(d2, axis=1)
+        best_distance = np.sqrt(d2[np.arange(len(best)), best])
+        found = best_distance < max_distance
+        index[start:stop] = np.where(found, best, -1)
+        distance[start:stop] = np.where(found, best_distance, np.inf)
+    return index, distance
+
+class PointGrid:
+    """Cell list vectorizada: puntos ordenados por celda con consultas en lote."""
+
+    def __init__(self, px, py, cell_size=None, width=None, height=None, counter=None):
+        width = GRID_SIZE if width is None else width
+        height = GRID_SIZE if height is None else height
+        if cell_size is None:
+            cell_size = auto_cell_size(width, height, len(px))
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.counter = counter  # Contador del perfilador para los puntos revisados (None: no se cuentan)
+        self.px = np.asarray(px, dtype=np.float64)
+        self.py = np.asarray(py, dtype=np.float64)
+        cell = self._cell_x(self.px) * self.rows + self._cell_y(self.py)
+        self.order = np.argsort(cell, kind="stable")
+        self.sorted_x = self.px[self.order]
+        self.sorted_y = self.py[self.order]
+        self.counts = np.bincount(cell, minlength=self.cols * self.rows)
+        self.starts = np.cumsum(self.counts) - self.counts
+
+    def __len__(self):
+        return len(self.px)
+
+    def _count(self, pairs):
+        if profiler.enabled:
+            profiler.count("distance_computations", pairs)
+            if self.counter is not None:
+                profiler.count(self.counter, pairs)
+
+    def _cell_x(self, x):
+        return np.clip((x // self.cell_size).astype(np.int64), 0, self.cols - 1)
+
+    def _cell_y(self, y):
+        return np.clip((y // self.cell_size).astype(np.int64), 0, self.rows - 1)
+
+    @staticmethod
+    def _ring_offsets(ring):
+        if ring == 0:
+            return np.zeros((1, 2), dtype=np.int64)
+        side = np.arange(-ring, ring + 1)
+        inner = np.arange(-ring + 1, ring)
+        return np.concatenate([
+            np.stack([side, np.full_like(side, -ring)], axis=1),
+            np.stack([side, np.full_like(side, ring)], axis=1),
+            np.stack([np.full_like(inner, -ring), inner], axis=1),
+            np.stack([np.full_like(inner, ring), inner], axis=1),
+        ])
+
+    def nearest(self, qx, qy, q_family=None, p_family=None, max_distance=np.inf):
+        """Vecino más cercano de cada consulta; misma interfaz que `nearest_brute_force`."""
+        qx = np.asarray(qx, dtype=np.float64)
+        qy = np.asarray(qy, dtype=np.float64)
+        best = np.full(len(qx), -1, dtype=np.int64)
+        best_d2 = np.full(len(qx), float(max_distance) ** 2, dtype=np.float64)
+        if len(qx) == 0 or len(self.px) == 0:
+            return best, np.full(len(qx), np.inf)
+        sorted_family = None if p_family is None else np.asarray(p_family)[self.order]
+        query_cx, query_cy = self._cell_x(qx), self._cell_y(qy)
+        pending = np.arange(len(qx))
+        for ring in range(max(self.cols, self.rows)):
+            if ring > 0:
+                lower = (ring - 1) * self.cell_size
+                pending = pending[best_d2[pending] > lower * lower]
+            if len(pending) == 0:
+                break
+            offsets = self._ring_offsets(ring)
+            if len(offsets) > len(self.px):
+                # Quedan pocas celdas ocupadas por anillo: se termina por fuerza bruta.
+                index, distance = nearest_brute_force(
+                    qx[pending], qy[pending], self.px, self.py,
+                    None if q_family is None else q_family[pending], p_family, max_distance)
+                self._count(len(pending) * len(self.px))
+                better = (index >= 0) & (distance ** 2 < best_d2[pending])
+                inverse = np.empty_like(self.order)
+                inverse[self.order] = np.arange(len(self.order))
+                best[pending[better]] = inverse[index[better]]
+                best_d2[pending[better]] = distance[better] ** 2
+                break
+            cells_x = query_cx[pending, None] + offsets[None, :, 0]
+            cells_y = query_cy[pending, None] + offsets[None, :, 1]
+            inside = (cells_x >= 0) & (cells_x < self.cols) & (cells_y >= 0) & (cells_y < self.rows)
+            owner = np.broadcast_to(pending[:, None], cells_x.shape)[inside]
+            cells = cells_x[inside] * self.rows + cells_y[inside]
+            counts = self.counts[cells]
+            occupied = counts > 0
+            owner, cells, counts = owner[occupied], cells[occupied], counts[occupied]
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            self._count(total)
+            pair_query = np.repeat(owner, counts)
+            pair_point = np.repeat(self.starts[cells] - (np.cumsum(counts) - counts), counts) + np.arange(total)
+            d2 = (qx[pair_query] - self.sorted_x[pair_point]) ** 2 + (qy[pair_query] - self.sorted_y[pair_point]) ** 2
+            if q_family is not None:
+                d2[q_family[pair_query] == sorted_family[pair_point]] = np.inf
+            # Los pares ya vienen agrupados por consulta: mínimo por grupo sin ordenar.
+            group_starts = np.flatnonzero(np.r_[True, pair_query[1:] != pair_query[:-1]])
+            group_min = np.minimum.reduceat(d2, group_starts)
+            group = np.repeat(np.arange(len(group_starts)), np.diff(np.r_[group_starts, len(d2)]))
+            hits = np.flatnonzero(d2 == group_min[group])
+            winners = hits[np.r_[True, group[hits][1:] != group[hits][:-1]]]
+            query, d2 = pair_query[winners], d2[winners]
+            better = d2 < best_d2[query]
+            best[query[better]] = pair_point[winners][better]
+            best_d2[query[better]] = d2[better]
+        found = best >= 0
+        index = np.where(found, self.order[np.where(found, best, 0)], -1)
+        return index, np.where(found, np.sqrt(best_d2), np.inf)
@@ -0,0 +1,105 @@
+# stats_tracker.py
+"""Estadísticas de la corrida actualizadas con cada nacimiento, comida, reproducción y muerte.
+
+Reemplaza los ordenamientos completos y el conteo de familias O(N²) de la pantalla
+final: se mantienen montículos de tamaño k para los récords y un contador por familia
+(`parent_color`), así que consultar los resultados cuesta O(k) y se puede hacer durante
+la corrida. Los eventos los reportan los métodos de Creature (motor de objetos).
+"""
+import heapq
+from collections import Counter
+
+TOP_K = 3
+
+class TopK:
+    """Los k ids con mayor valor; los valores de cada id solo crecen.
+
+    Ante empates gana el id más chico (la criatura más vieja), igual que ordenar la lista
+    de criaturas por id y luego por valor de forma estable.
+    """
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self._heap = []  # [valor, -id, elemento]; la raíz es el más chico de los k
+        self._entries = {}  # id -> entrada del montículo
+
+    def __len__(self):
+        return len(self._heap)
+
+    def update(self, key, value, item):
+        """Registra el nuevo valor de `key` (un id) junto con `item` (lo que se muestra)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[0] = value
+            heapq.heapify(self._heap)  # k elementos: rearmar es O(k)
+            return
+        entry = [value, -key, item]
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            evicted = heapq.heapreplace(self._heap, entry)
+            del self._entries[-evicted[1]]
+        else:
+            return
+        self._entries[key] = entry
+
+    def top(self):
+        """Lista de (elemento, valor) de mayor a menor."""
+        return [(entry[2], entry[0]) for entry in sorted(self._heap, reverse=True)]
+
+class StatsTracker:
+    """Récords por criatura y tamaños de familia de la corrida en curso."""
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.reset()
+
+    def reset(self):
+        self.time_alive = TopK(self.k)
+        self.food_eaten = TopK(self.k)
+        self.reproductions = TopK(self.k)
+        self.families = Counter()  # parent_color -> integrantes totales (en orden de aparición)
+        self.family_traits = {}  # parent_color -> (es carnívora, personalidad) de su primer integrante
+        self.alive_families = Counter()  # parent_color -> integrantes vivos
+        self.born = 0
+        self.dead = 0
+        self.meals = 0
+
+    def on_birth(self, creature):
+        self.born += 1
+        color = creature.parent_color
+        self.families[color] += 1
+        self.alive_families[color] += 1
+        if color not in self.family_traits:
+            self.family_traits[color] = (creature.is_carnivore, creature.personality)
+        # Las criaturas que siguen vivas al final cuentan con sus valores iniciales, como en la lista completa
+        self.time_alive.update(creature.id, creature.time_alive, creature)
+        self.food_eaten.update(creature.id, creature.food_eaten_total, creature)
+        self.reproductions.update(creature.id, creature.reproductions, creature)
+
+    def on_meal(self, creature):
+        self.meals += 1
+
+    def on_reproduction(self, creature):
+        self.food_eaten.update(creature.id, creature.food_eaten_total, creature)
+        self.reproductions.update(creature.id, creature.reproductions, creature)
+
+    def on_death(self, creature):
+        self.dead += 1
+        self.alive_families[creature.parent_color] -= 1
+        self.time_alive.update(creature.id, creature.time_alive, creature)
+
+    def top_families(self, k=None):
+        """Familias más numerosas como (color, integrantes, es carnívora, personalidad)."""
+        return [(color, count, *self.family_traits[color]) for color, count in self.families.most_common(k or self.k)]
+
+    def live_lines(self):
+        """Resumen corto para mostrar durante la corrida."""
+        families = sum(1 for count in self.alive_families.values() if count > 0)
+        return [
+            f"Vivas: {self.born - self.dead} - Nacidas: {self.born} - Muertas: {self.dead}",
+            f"Comidas: {self.meals} - Familias vivas: {families}",
+        ]
+
+# Estadísticas de la corrida en curso
+stats = StatsTracker()
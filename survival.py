@@ -0,0 +1,36 @@
+# survival.py
+"""Modelo de supervivencia Weibull aplicado a toda la población de una vez."""
+import numpy as np
+
+from config import DEATH_SHAPE, DEATH_SCALE, TICKS_PER_SECOND
+from stats_tracker import stats
+
+HAZARD_STEP = 0.1  # Aproximación discreta: probabilidad de morir en un tick = hazard * HAZARD_STEP
+
+def weibull_hazard(t):
+    """Tasa de riesgo Weibull para `t` segundos sin comer (escalar o array)."""
+    return (DEATH_SHAPE/DEATH_SCALE) * (t/DEATH_SCALE)**(DEATH_SHAPE-1)
+
+def death_delays(exponentials):
+    """Segundos sin comer hasta la muerte para desvíos Exp(1) (escalar o array).
+
+    Es el límite continuo del modelo por ticks: un riesgo de weibull_hazard(t) * HAZARD_STEP
+    por tick acumula HAZARD_STEP * TICKS_PER_SECOND * (t/DEATH_SCALE)**DEATH_SHAPE, y se invierte.
+    """
+    return DEATH_SCALE * (np.asarray(exponentials) / (HAZARD_STEP * TICKS_PER_SECOND)) ** (1 / DEATH_SHAPE)
+
+def survival_step(eat_times, now, uniforms):
+    """Devuelve las posiciones de `eat_times` cuyas criaturas mueren en este tick.
+
+    `uniforms` son sorteos uniformes en [0, 1), uno por criatura viva.
+    """
+    hazard = weibull_hazard(now - np.asarray(eat_times, dtype=np.float64))
+    return np.flatnonzero(uniforms < hazard * HAZARD_STEP)
+
+def apply_deaths(creatures, now):
+    """Registra la muerte de cada criatura de la lista (Creature o CreatureView)."""
+    for creature in creatures:
+        creature.alive = False
+        creature.death_time = now
+        creature.time_alive = now - creature.birth_time
+        stats.on_death(creature)
@@ -0,0 +1,214 @@
+# sweep.py
+"""Barridos de parámetros con caché de resultados.
+
+Un punto del barrido es un diccionario con parámetros de `show_initial_screen`
+(`population_size`, `speed_max`, ...) y constantes de config.py (`MOVEMENT_KAPPA`,
+`DEATH_SHAPE`, `DEATH_SCALE`, `FOOD_REGIME_TRANSITIONS`, `GRID_SIZE`). Cada punto se corre con las
+mismas semillas y cada corrida se guarda en disco bajo un hash de (punto, semilla,
+ticks, motor, versión del código): repetir o extender un barrido solo corre lo nuevo.
+
+Uso: python sweep.py --grid 'population_size=[10, 50]' --grid 'DEATH_SCALE=[6, 8, 10]' --runs 5 --seed 1
+     python sweep.py --samples 20 --range 'DEATH_SHAPE=[1, 2.5]' --runs 3
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import config
+import creature
+import food
+import food_regime
+import population_arrays
+import spatial_grid
+import sim_random
+import survival
+from config import DEFAULT_PARAMS
+from headless import simulate, BACKENDS
+from replicates import replicate_seeds, aggregate
+
+SIM_PARAMS = tuple(name for name in DEFAULT_PARAMS if name != "save_csv")
+CONFIG_PARAMS = ("MOVEMENT_KAPPA", "DEATH_SHAPE", "DEATH_SCALE", "FOOD_REGIME_TRANSITIONS", "GRID_SIZE")
+# Módulos que importan por nombre las constantes de CONFIG_PARAMS
+CONFIG_MODULES = (config, creature, food, food_regime, population_arrays, sim_random, spatial_grid, survival)
+# Fuentes cuyo contenido define la versión del código en las claves de la caché
+ENGINE_SOURCES = ("config.py", "creature.py", "events.py", "food.py", "food_regime.py", "headless.py", "population_arrays.py",
+                  "sim_clock.py", "sim_random.py", "simulation.py", "spatial_grid.py", "survival.py", "trajectory.py",
+                  "world_summary.py")
+CACHE_DIR = ".sweep_cache"
+
+def code_version():
+    """Hash del código del motor de simulación."""
+    digest = hashlib.sha256()
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name in ENGINE_SOURCES:
+        with open(os.path.join(base, name), "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+def split_point(point):
+    """Separa un punto en (params de la simulación, constantes de config)."""
+    params, overrides = {}, {}
+    for name, value in point.items():
+        if name in SIM_PARAMS:
+            params[name] = value
+        elif name in CONFIG_PARAMS:
+            overrides[name] = value
+        else:
+            raise ValueError(f"Parámetro de barrido desconocido: {name}")
+    return params, overrides
+
+@contextmanager
+def config_overrides(overrides):
+    """Reemplaza temporalmente constantes de config.py en todos los módulos que las usan."""
+    saved = []
+    try:
+        for name, value in overrides.items():
+            for module in CONFIG_MODULES:
+                if hasattr(module, name):
+                    saved.append((module, name, getattr(module, name)))
+                    setattr(module, name, value)
+        yield
+    finally:
+        for module, name, value in reversed(saved):
+            setattr(module, name, value)
+
+def grid(space):
+    """Todos los puntos del producto cartesiano de `space` (nombre -> lista de valores)."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+def random_points(space, samples, seed=None):
+    """`samples` puntos al azar: listas se eligen por valor y tuplas (low, high) se sortean uniformes
+    (enteros si ambos extremos son enteros)."""
+    rng = random.Random(seed)
+    points = []
+    for _ in range(samples):
+        point = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                point[name] = rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) else rng.uniform(low, high)
+            else:
+                point[name] = rng.choice(values)
+        points.append(point)
+    return points
+
+class ResultCache:
+    """Resúmenes de corridas guardados como JSON en un directorio, uno por clave."""
+
+    def __init__(self, directory=CACHE_DIR, version=None):
+        self.directory = directory
+        self.version = version or code_version()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, point, seed, ticks, backend):
+        content = json.dumps({"point": point, "seed": seed, "ticks": ticks, "backend": backend, "code": self.version}, sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key, summary):
+        # Se escribe a un temporal y se renombra para no dejar archivos a medias
+        temporary = self._path(key) + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(summary, file)
+        os.replace(temporary, self._path(key))
+
+def run_point(task):
+    """Corre un punto del barrido con una semilla (en un proceso del pool)."""
+    point, seed, ticks, backend = task
+    params, overrides = split_point(point)
+    with config_overrides(overrides):
+        return simulate(params, ticks=ticks, seed=seed, backend=backend, trajectory="off")
+
+def run_sweep(points, seeds=5, ticks=1000, backend="objects", workers=None, seed=None, cache=None):
+    """Corre cada punto con cada semilla y devuelve una lista de resultados por punto.
+
+    Cada resultado tiene el punto, sus resúmenes (en el orden de las semillas) y su agregado
+    (`replicates.aggregate`). Las corridas que ya están en `cache` no se repiten. También
+    devuelve cuántas corridas se hicieron y cuántas salieron de la caché.
+    """
+    if isinstance(seeds, int):
+        seeds = replicate_seeds(seeds, seed)
+    for point in points:
+        split_point(point)  # Valida los nombres antes de empezar
+    tasks = [(point, s, ticks, backend) for point in points for s in seeds]
+    keys = [cache.key(*task) for task in tasks] if cache is not None else [None] * len(tasks)
+    summaries = [cache.get(key) if key is not None else None for key in keys]
+    pending = [i for i, summary in enumerate(summaries) if summary is None]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(pending) <= 1:
+        results = (run_point(tasks[i]) for i in pending)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(run_point, [tasks[i] for i in pending], chunksize=max(1, len(pending) // (4 * workers)))
+    try:
+        for i, summary in zip(pending, results):
+            summaries[i] = summary
+            if cache is not None:
+                cache.put(keys[i], summary)  # Cada corrida se guarda al terminar
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    output = []
+    for index, point in enumerate(points):
+        point_summaries = summaries[index * len(seeds):(index + 1) * len(seeds)]
+        output.append({"point": point, "summaries": point_summaries, "aggregate": aggregate(point_summaries)})
+    return output, {"ran": len(pending), "cached": len(tasks) - len(pending)}
+
+def _assignment(text):
+    name, _, value = text.partition("=")
+    return name.strip(), json.loads(value)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de la simulación con caché de resultados.")
+    parser.add_argument("--grid", type=_assignment, action="append", default=[], metavar="NOMBRE=[V1, V2, ...]",
+                        help="Valores de un parámetro (JSON). Sin --samples se recorre el producto de todas las grillas.")
+    parser.add_argument("--range", type=_assignment, action="append", default=[], metavar="NOMBRE=[MIN, MAX]",
+                        help="Intervalo de un parámetro para el muestreo al azar (requiere --samples).")
+    parser.add_argument("--samples", type=int, default=None, help="Cantidad de puntos al azar en lugar de la grilla.")
+    parser.add_argument("--runs", type=int, default=5, help="Semillas por punto.")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla de las réplicas y del muestreo.")
+    parser.add_argument("--ticks", type=int, default=1000, help="Cantidad máxima de ticks por corrida.")
+    parser.add_argument("--backend", choices=BACKENDS, default="objects", help="Motor de población.")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos a usar (por defecto, todos los núcleos).")
+    parser.add_argument("--cache", default=CACHE_DIR, help="Directorio de la caché de resultados.")
+    parser.add_argument("--no-cache", action="store_true", help="No leer ni guardar resultados en la caché.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.samples is not None:
+        space = {name: values for name, values in args.grid}
+        space.update({name: tuple(bounds) for name, bounds in args.range})
+        points = random_points(space, args.samples, args.seed)
+    else:
+        if args.range:
+            raise SystemExit("--range requiere --samples")
+        points = grid(dict(args.grid))
+    cache = None if args.no_cache else ResultCache(args.cache)
+    results, counts = run_sweep(points, args.runs, ticks=args.ticks, backend=args.backend, workers=args.workers, seed=args.seed, cache=cache)
+    print(json.dumps({
+        **counts,
+        "points": [{"point": result["point"], "runs": result["aggregate"]["runs"], "extinctions": result["aggregate"]["extinctions"],
+                    "statistics": result["aggregate"]["statistics"]} for result in results],
+    }))
+
+if __name__ == "__main__":
+    main()
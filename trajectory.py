@@ -0,0 +1,144 @@
+# trajectory.py
+"""Trayectorias de las criaturas en bloques preasignados de float32.
+
+Reemplaza las listas `movement_history` de tuplas que crecían sin límite. La
+política de retención decide qué se guarda:
+
+- "off": no se guarda nada.
+- "ring": los últimos `length` pasos de cada criatura (buffer circular).
+- "stride": uno de cada `stride` pasos de cada criatura.
+- "sample": todos los pasos de una de cada `sample_every` criaturas (ids 1, 1 + n, ...).
+"""
+import numpy as np
+
+from config import TRAJECTORY_POLICY, TRAJECTORY_LENGTH, TRAJECTORY_STRIDE, TRAJECTORY_SAMPLE_EVERY
+
+POLICIES = ("off", "ring", "stride", "sample")
+FIRST_BLOCK_ROWS = 64  # Filas del primer bloque de una trayectoria; los siguientes duplican
+MAX_BLOCK_ROWS = 4096
+
+class _Track:
+    __slots__ = ("blocks", "rows", "steps")
+
+    def __init__(self, rows):
+        self.blocks = [np.empty((rows, 3), dtype=np.float32)]
+        self.rows = 0  # Filas escritas (en "ring", total de pasos guardados incluyendo los pisados)
+        self.steps = 0  # Pasos recibidos
+
+class TrajectoryStore:
+    """Guarda posiciones (x, y, t) por id de criatura según una política de retención."""
+
+    def __init__(self, policy=TRAJECTORY_POLICY, length=TRAJECTORY_LENGTH, stride=TRAJECTORY_STRIDE, sample_every=TRAJECTORY_SAMPLE_EVERY):
+        self.configure(policy, length, stride, sample_every)
+
+    def configure(self, policy=TRAJECTORY_POLICY, length=TRAJECTORY_LENGTH, stride=TRAJECTORY_STRIDE, sample_every=TRAJECTORY_SAMPLE_EVERY):
+        """Cambia la política de retención y descarta las trayectorias guardadas."""
+        if policy not in POLICIES:
+            raise ValueError(f"Política de trayectorias desconocida: {policy}")
+        self.policy = policy
+        self.length = length
+        self.stride = stride
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self):
+        self._tracks = {}
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def __contains__(self, creature_id):
+        return creature_id in self._tracks
+
+    def ids(self):
+        return list(self._tracks)
+
+    def tracks(self, creature_id):
+        """Indica si la política guarda la trayectoria de esta criatura."""
+        if self.policy == "off":
+            return False
+        if self.policy == "sample":
+            return (creature_id - 1) % self.sample_every == 0
+        return True
+
+    def record(self, creature_id, x, y, t):
+        """Agrega un paso a la trayectoria de la criatura (si la política lo retiene)."""
+        track = self._tracks.get(creature_id)
+        if track is None:
+            if not self.tracks(creature_id):
+                return
+            rows = self.length if self.policy == "ring" else FIRST_BLOCK_ROWS
+            track = self._tracks[creature_id] = _Track(rows)
+        track.steps += 1
+        if self.policy == "stride" and (track.steps - 1) % self.stride:
+            return
+        if self.policy == "ring":
+            track.blocks[0][track.rows % self.length] = (x, y, t)
+            track.rows += 1
+            return
+        block = track.blocks[-1]
+        used = track.rows - sum(len(b) for b in track.blocks[:-1])
+        if used == len(block):
+            block = np.empty((min(2 * len(block), MAX_BLOCK_ROWS), 3), dtype=np.float32)
+            track.blocks.append(block)
+            used = 0
+        block[used] = (x, y, t)
+        track.rows += 1
+
+    def record_many(self, creature_ids, xs, ys, t):
+        """Agrega un paso para varias criaturas (motor de arrays)."""
+        if self.policy == "off":
+            return
+        ids = np.asarray(creature_ids)
+        if self.policy == "sample":
+            keep = (ids - 1) % self.sample_every == 0
+            ids, xs, ys = ids[keep], np.asarray(xs)[keep], np.asarray(ys)[keep]
+        for creature_id, x, y in zip(ids.tolist(), np.asarray(xs).tolist(), np.asarray(ys).tolist()):
+            self.record(creature_id, x, y, t)
+
+    def get(self, creature_id):
+        """Trayectoria de la criatura como array (n, 3) de (x, y, t) en orden cronológico."""
+        track = self._tracks.get(creature_id)
+        if track is None:
+            return np.empty((0, 3), dtype=np.float32)
+        if self.policy == "ring":
+            ring = track.blocks[0]
+            if track.rows <= self.length:
+                return ring[:track.rows]
+            start = track.rows % self.length
+            return np.concatenate([ring[start:], ring[:start]])
+        return np.concatenate(track.blocks)[:track.rows]
+
+    def _stored(self, track):
+        """Filas escritas de la trayectoria tal como están en memoria (en "ring", sin rotar)."""
+        if self.policy == "ring":
+            return track.blocks[0][:min(track.rows, self.length)]
+        return np.concatenate(track.blocks)[:track.rows]
+
+    def state(self):
+        """Trayectorias guardadas como arrays planos: ids, filas, pasos recibidos y puntos concatenados."""
+        tracks = list(self._tracks.values())
+        return {
+            "ids": np.array(list(self._tracks), dtype=np.int64),
+            "rows": np.array([track.rows for track in tracks], dtype=np.int64),
+            "steps": np.array([track.steps for track in tracks], dtype=np.int64),
+            "points": np.concatenate([self._stored(track) for track in tracks]) if tracks else np.empty((0, 3), dtype=np.float32),
+        }
+
+    def restore(self, ids, rows, steps, points):
+        """Reemplaza las trayectorias por las de `state` (con la misma política configurada)."""
+        self.reset()
+        start = 0
+        for creature_id, track_rows, track_steps in zip(ids.tolist(), rows.tolist(), steps.tolist()):
+            stored = min(track_rows, self.length) if self.policy == "ring" else track_rows
+            track = _Track(self.length if self.policy == "ring" else max(stored, FIRST_BLOCK_ROWS))
+            track.blocks[0][:stored] = points[start:start + stored]
+            track.rows, track.steps = track_rows, track_steps
+            self._tracks[creature_id] = track
+            start += stored
+
+    def nbytes(self):
+        return sum(block.nbytes for track in self._tracks.values() for block in track.blocks)
+
+# Trayectorias de la simulación en curso
+trajectories = TrajectoryStore()
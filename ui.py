@@ -1,24 +1,29 @@
-import threading
+import numpy as np
 import pygame
-from GPT import get_summary
-from config import CELL_SIZE, SCREEN_SIZE,BLACK,WHITE,RED,GREEN,font_large, font, font_huge
-from utils import divide_text, get_colour_name
+from config import CELL_SIZE, GRID_SIZE, SCREEN_SIZE,BLACK,WHITE,RED,GREEN, DEFAULT_PARAMS, DIRTY_RECT_LIMIT, LABEL_MAX_POPULATION, LABEL_MIN_CELL_SIZE
+from config import MIN_ZOOM, MAX_ZOOM, PAN_STEP, ZOOM_STEP
+
+# Fuentes; se crean en init_fonts al dibujar la primera pantalla, no al importar el módulo
+font = None  # Fuente para dibujar los números
+font_large = None  # Fuente más grande para las estadísticas
+font_huge = None  # Fuente más grande para las estadísticas
+
+def init_fonts():
+  """Inicializa pygame y crea las fuentes (solo la primera vez)."""
+  global font, font_large, font_huge
+  if font is None:
+      pygame.init()
+      font = pygame.font.Font(None, 25)
+      font_large = pygame.font.Font(None, 30)
+      font_huge = pygame.font.Font(None, 50)
 
 def show_initial_screen():
+  init_fonts()
   screen = pygame.display.set_mode((SCREEN_SIZE, SCREEN_SIZE))
   pygame.display.set_caption("Configuración Inicial")
   
   # Parámetros y valores por defecto
-  params = {
-      "population_size": 10,
-      "carnivore_percentage": 20,
-      "initial_food": 20,
-      "size_min": 10,
-      "size_max": 35,
-      "speed_min": 1.0,
-      "speed_max": 4.0,
-      "save_csv": True
-  }
+  params = dict(DEFAULT_PARAMS)
   random_carnivore = False
 
   # Loop de configuración
@@ -48,6 +53,7 @@ def show_initial_screen():
           screen.blit(font.render(text, True, color), (150, 160 + i * 40))
           
       screen.blit(font_large.render("Durante la simulación puede presionar ESC para detenerla.", True, BLACK), (150, 490))
+      screen.blit(font.render("Rueda del mouse o + y -: zoom. Arrastrar o W, A, S, D: mover la vista. Inicio: ver todo.", True, BLACK), (150, 525))
       
       pygame.display.flip()
       
@@ -78,7 +84,7 @@ def show_initial_screen():
                   elif option == "speed_min":
                       params["speed_min"] = max(1, params["speed_min"] + 1)
                   elif option == "speed_max":
-                      params["speed_max"] = min(10.0, params["speed_max"] + 1)
+                      params["speed_max"] = min(10, params["speed_max"] + 1)
                   elif option == "save_csv":
                       params["save_csv"] = not params["save_csv"]
                   elif option == "carnivore_percentage":
@@ -104,48 +110,186 @@ def show_initial_screen():
                   elif option == "carnivore_percentage":
                       random_carnivore = not random_carnivore
                     
-def visualize_population(screen, population, food_sources):
-  """Visualiza la población y la comida en la ventana de pygame."""
+class Camera:
+  """Parte del mundo que se ve en la ventana: esquina superior izquierda (x, y) en celdas y zoom en píxeles por celda.
+
+  La ventana no depende del tamaño del mundo: al empezar la cámara muestra el mundo
+  entero (con celdas de CELL_SIZE píxeles como máximo) y después se puede desplazar y
+  acercar o alejar. Si la vista es más grande que el mundo, el mundo queda centrado.
+  """
+
+  def __init__(self, width=SCREEN_SIZE, height=SCREEN_SIZE, world_size=GRID_SIZE):
+      self.width = width
+      self.height = height
+      self.world_size = world_size
+      self.reset()
+
+  def reset(self):
+      """Vuelve a mostrar el mundo entero."""
+      self.zoom = min(CELL_SIZE, min(self.width, self.height) / self.world_size)
+      self.x = self.y = 0.0
+      self._clamp()
+
+  def view(self):
+      """(x, y, zoom); cambia cada vez que la cámara se mueve."""
+      return self.x, self.y, self.zoom
+
+  def _clamp(self):
+      for axis, pixels in (("x", self.width), ("y", self.height)):
+          span = pixels / self.zoom
+          if span >= self.world_size:
+              setattr(self, axis, (self.world_size - span) / 2)
+          else:
+              setattr(self, axis, min(max(getattr(self, axis), 0.0), self.world_size - span))
+
+  def pan(self, dx, dy):
+      """Desplaza la vista `dx`, `dy` veces el ancho y el alto de la ventana."""
+      self.x += dx * self.width / self.zoom
+      self.y += dy * self.height / self.zoom
+      self._clamp()
+
+  def drag(self, dx, dy):
+      """Arrastra el mundo `dx`, `dy` píxeles (por ejemplo con el mouse)."""
+      self.x -= dx / self.zoom
+      self.y -= dy / self.zoom
+      self._clamp()
+
+  def zoom_at(self, factor, px, py):
+      """Multiplica el zoom por `factor` dejando fijo el punto del mundo que está en el píxel (px, py)."""
+      world_x, world_y = self.x + px / self.zoom, self.y + py / self.zoom
+      self.zoom = min(max(self.zoom * factor, MIN_ZOOM), MAX_ZOOM)
+      self.x, self.y = world_x - px / self.zoom, world_y - py / self.zoom
+      self._clamp()
+
+  def visible(self, x, y, margin=0.0):
+      """Máscara de los puntos (arrays de celdas) que se ven en la ventana, con `margin` celdas de más."""
+      # Cada punto se dibuja en su celda, que ocupa [x, x + 1) en el mundo
+      return ((x > self.x - 1 - margin) & (x < self.x + self.width / self.zoom + margin)
+              & (y > self.y - 1 - margin) & (y < self.y + self.height / self.zoom + margin))
+
+  def handle_event(self, event):
+      """Atiende los controles de la cámara; devuelve True si `event` era uno de ellos.
+
+      Rueda del mouse: acercar y alejar en el puntero. Arrastrar con el botón izquierdo o
+      W, A, S, D: desplazar. + y -: acercar y alejar en el centro. Inicio: ver todo el mundo.
+      """
+      if event.type == pygame.MOUSEWHEEL:
+          self.zoom_at(ZOOM_STEP ** event.y, *pygame.mouse.get_pos())
+      elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+          self.drag(*event.rel)
+      elif event.type == pygame.KEYDOWN and event.key in _PAN_KEYS:
+          self.pan(*_PAN_KEYS[event.key])
+      elif event.type == pygame.KEYDOWN and event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+          self.zoom_at(ZOOM_STEP, self.width / 2, self.height / 2)
+      elif event.type == pygame.KEYDOWN and event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+          self.zoom_at(1 / ZOOM_STEP, self.width / 2, self.height / 2)
+      elif event.type == pygame.KEYDOWN and event.key == pygame.K_HOME:
+          self.reset()
+      else:
+          return False
+      return True
+
+_PAN_KEYS = {
+  pygame.K_w: (0, -PAN_STEP),
+  pygame.K_s: (0, PAN_STEP),
+  pygame.K_a: (-PAN_STEP, 0),
+  pygame.K_d: (PAN_STEP, 0),
+}
+
+class _RenderCache:
+  """IDs ya dibujados y zonas del cuadro anterior de visualize_population."""
+
+  def __init__(self):
+      self.labels = {}  # (id, es carnívoro) -> texto del ID; solo las criaturas del último cuadro
+      self.rects = []  # Zonas dibujadas en el cuadro anterior
+      self.screen = None
+      self.view = None  # Cámara (x, y, zoom) del cuadro anterior
+
+_render_cache = _RenderCache()
+
+def reset_render_cache():
+  """Olvida el cuadro anterior (llamar cuando otra pantalla dibujó sobre la ventana)."""
+  _render_cache.rects = []
+  _render_cache.screen = None
+
+def visualize_population(screen, population, food_sources, overlay=None, camera=None):
+  """Visualiza la población y la comida que se ven con `camera` (Camera; por defecto, todo el mundo).
+
+  Solo se dibuja lo que cae dentro de la ventana. Los IDs se dibujan una vez por criatura
+  y se reutilizan; se omiten con muchas criaturas a la vista o con celdas chicas. A la
+  ventana solo se envían las zonas que cambiaron (lo dibujado en este cuadro y en el
+  anterior), salvo que sean tantas que convenga enviar todo o que la cámara se haya
+  movido. `overlay` son líneas de texto (por ejemplo los tiempos del perfilador) que se
+  dibujan arriba a la izquierda.
+  """
+  alive = [creature for creature in population if creature.alive]
+  food_x, food_y, _ = food_sources.cells()
+  x = np.array([c.x for c in alive], dtype=np.float64)
+  y = np.array([c.y for c in alive], dtype=np.float64)
+  _draw_world(screen, food_x, food_y, x, y, [c.id for c in alive], [c.size for c in alive],
+              [c.parent_color for c in alive], [c.is_carnivore for c in alive], overlay, camera)
+
+def visualize_snapshot(screen, snapshot, overlay=None, camera=None):
+  """Igual que visualize_population, a partir de una instantánea de sim_thread.SimulationThread."""
+  _draw_world(screen, snapshot.food_x, snapshot.food_y, snapshot.x, snapshot.y, snapshot.ids, snapshot.sizes,
+              snapshot.colors, snapshot.carnivores, overlay, camera)
+
+def _draw_world(screen, food_x, food_y, x, y, ids, sizes, colors, carnivores, overlay, camera):
+  """Dibuja la comida y las criaturas (columnas por criatura) que se ven con `camera` y actualiza la ventana."""
+  init_fonts()
+  cache = _render_cache
+  camera = camera or Camera(*screen.get_size())
+  zoom = camera.zoom
+  # Borrar todo con un solo fill es más barato que borrar cada zona por separado
   screen.fill(WHITE)
+  rects = []
+  half = zoom // 2
+  if camera.width / zoom > camera.world_size or camera.height / zoom > camera.world_size:
+      # El mundo entero entra en la ventana: se marca su borde
+      rects.append(pygame.draw.rect(screen, BLACK, (-camera.x * zoom, -camera.y * zoom,
+                                                    camera.world_size * zoom, camera.world_size * zoom), 1))
 
-  # Dibujar comida (verde)
-  for food in food_sources:
-      pygame.draw.circle(screen, GREEN, (food.x * CELL_SIZE + CELL_SIZE // 2, food.y * CELL_SIZE + CELL_SIZE // 2), CELL_SIZE // 3)
-
-  # Dibujar criaturas (en colores según el padre)
-  for creature in population:
-      if creature.alive:
-          # Dibujar la criatura como un círculo con el tamaño de la criatura
-          pygame.draw.circle(screen, creature.parent_color, 
-                              (creature.x * CELL_SIZE + CELL_SIZE // 2, creature.y * CELL_SIZE + CELL_SIZE // 2), 
-                              creature.size)
-          # Dibujar el ID de la criatura sobre su cabeza
-          id_text = font.render(str(creature.id) , True, RED if creature.is_carnivore else BLACK)
-          screen.blit(id_text, (creature.x * CELL_SIZE, creature.y * CELL_SIZE))
+  # Dibujar comida (verde), un círculo por celda con comida a la vista
+  visible = camera.visible(food_x, food_y)
+  food_radius = max(1, int(zoom // 3))
+  for fx, fy in zip(((food_x[visible] - camera.x) * zoom).tolist(), ((food_y[visible] - camera.y) * zoom).tolist()):
+      rects.append(pygame.draw.circle(screen, GREEN, (fx + half, fy + half), food_radius))
 
-  pygame.display.flip()
+  # Dibujar criaturas (en colores según el padre) con su ID encima; el radio en píxeles crece con el zoom
+  scale = zoom / CELL_SIZE
+  shown = np.flatnonzero(camera.visible(x, y, max(sizes, default=0) / CELL_SIZE))
+  show_labels = len(shown) <= LABEL_MAX_POPULATION and zoom >= LABEL_MIN_CELL_SIZE
+  labels = {}
+  for i, px, py in zip(shown.tolist(), ((x[shown] - camera.x) * zoom).tolist(), ((y[shown] - camera.y) * zoom).tolist()):
+      rects.append(pygame.draw.circle(screen, colors[i], (px + half, py + half), max(1, sizes[i] * scale)))
+      if show_labels:
+          key = (ids[i], carnivores[i])
+          label = cache.labels.get(key)
+          if label is None:
+              label = font.render(str(ids[i]), True, RED if carnivores[i] else BLACK)
+          labels[key] = label
+          rects.append(screen.blit(label, (px, py)))
+  cache.labels = labels
 
-def show_statistics(screen, population):
-  """Muestra las estadísticas de las criaturas en la pantalla final."""
-  # Ordenar las estadísticas
-  top_lived = sorted(population, key=lambda x: x.time_alive, reverse=True)[:3]
-  top_eaten = sorted(population, key=lambda x: x.food_eaten_total, reverse=True)[:3]
-  top_reproductions = sorted(population, key=lambda x: x.reproductions, reverse=True)[:3]
-  top_families = []
-  for creature in population:
-      found = False
-      for color in top_families:
-          if color[0] == creature.parent_color:
-              found = True
-              
-      if not found:
-          occurences = 0
-          for creature2 in population:
-              if creature2.parent_color == creature.parent_color:
-                  occurences += 1
-          top_families.append((creature.parent_color, occurences, creature.is_carnivore, creature.personality))
-      
-  top_families = sorted(top_families, key=lambda x:x[1], reverse=True)[:3]
+  for i, line in enumerate(overlay or ()):
+      rects.append(screen.blit(font.render(line, True, BLACK, WHITE), (5, 5 + i * 20)))
+
+  if cache.screen is not screen or cache.view != camera.view() or len(cache.rects) + len(rects) > DIRTY_RECT_LIMIT:
+      pygame.display.flip()
+  else:
+      pygame.display.update(cache.rects + rects)
+  cache.rects = rects
+  cache.screen = screen
+  cache.view = camera.view()
+
+def show_statistics(screen, tracker):
+  """Muestra las estadísticas de la corrida (stats_tracker.StatsTracker) en la pantalla final."""
+  from utils import get_colour_name
+  init_fonts()
+  top_lived = tracker.time_alive.top()
+  top_eaten = tracker.food_eaten.top()
+  top_reproductions = tracker.reproductions.top()
+  top_families = tracker.top_families()
   
   screen.fill(WHITE)
 
@@ -156,22 +300,22 @@ def show_statistics(screen, population):
   screen.blit(font_large.render("Top 3 Familias por tamaño", True, BLACK), (50, 590))
 
   # Top 3 por tiempo vivido
-  for i, creature in enumerate(top_lived):
-      text = f"ID {creature.id} - Vivido: {round(creature.time_alive, 2)}s - Vel: {round(creature.speed, 2)} - Tam: {creature.size} - Familia: {get_colour_name(creature.parent_color)}"
+  for i, (creature, time_alive) in enumerate(top_lived):
+      text = f"ID {creature.id} - Vivido: {round(time_alive, 2)}s - Vel: {round(creature.speed, 2)} - Tam: {creature.size} - Familia: {get_colour_name(creature.parent_color)}"
       screen.blit(font.render(text, True, creature.parent_color), (50, 100 + i * 45))
       text = f"Carnivoro: {creature.is_carnivore} - personalidad: {creature.personality}"
       screen.blit(font.render(text, True, creature.parent_color), (50, 125 + i * 45))
       
   # Top 3 por comidas
-  for i, creature in enumerate(top_eaten):
-      text = f"ID {creature.id} - Comidas: {creature.food_eaten_total} - Vel: {round(creature.speed, 2)} - Tam: {creature.size} - Familia: {get_colour_name(creature.parent_color)}"
+  for i, (creature, food_eaten_total) in enumerate(top_eaten):
+      text = f"ID {creature.id} - Comidas: {food_eaten_total} - Vel: {round(creature.speed, 2)} - Tam: {creature.size} - Familia: {get_colour_name(creature.parent_color)}"
       screen.blit(font.render(text, True, creature.parent_color), (50, 270 + i * 45))
       text = f"Carnivoro: {creature.is_carnivore} - personalidad: {creature.personality}"
       screen.blit(font.render(text, True, creature.parent_color), (50, 295 + i * 45))
 
   # Top 3 por reproducciones
-  for i, creature in enumerate(top_reproductions):
-      text = f"ID {creature.id} - Reproducciones: {creature.reproductions} - Vel: {round(creature.speed, 2)} - Tam: {creature.size} - Familia: {get_colour_name(creature.parent_color)}"
+  for i, (creature, reproductions) in enumerate(top_reproductions):
+      text = f"ID {creature.id} - Reproducciones: {reproductions} - Vel: {round(creature.speed, 2)} - Tam: {creature.size} - Familia: {get_colour_name(creature.parent_color)}"
       screen.blit(font.render(text, True, creature.parent_color), (50, 440 + i * 45))
       text = f"Carnivoro: {creature.is_carnivore} - personalidad: {creature.personality}"
       screen.blit(font.render(text, True, creature.parent_color), (50, 465 + i * 45))
@@ -217,28 +361,17 @@ def show_statistics(screen, population):
     display_summary(screen)
 
 def display_summary(screen):
-  screen.fill(WHITE)
-  summary = []
-  hilo = threading.Thread(target=get_summary, args=(summary,))
-  hilo.start()
-  
-  while len(summary) == 0:
-    screen.blit(font_large.render("Generando...", True, BLACK), (SCREEN_SIZE // 2 - 100, SCREEN_SIZE - 100))
-    pygame.display.flip()
-  
-  summary_divided = divide_text(summary[0], 12)
-  
-  for i, line in enumerate(summary_divided):
-    screen.blit(pygame.font.Font(None, 27).render(line, True, BLACK), (50, 70 + i*20))
-  
-    # Botón para Volver al Menú Inicial
+  from GPT import SummaryRequest
+  from utils import divide_text
+  init_fonts()
+  # El resumen se pide en otro hilo; la ventana atiende eventos y muestra el texto a medida que llega
+  request = SummaryRequest()
+  request.start()
+  clock = pygame.time.Clock()
+  text_font = pygame.font.Font(None, 27)
   button_restart = pygame.Rect((SCREEN_SIZE // 2 - 100, SCREEN_SIZE - 100, 250, 50))
-  pygame.draw.rect(screen, RED, button_restart)
-  button_text = font_large.render("Reiniciar Simulación", True, WHITE)
-  screen.blit(button_text, (button_restart.x + 10, button_restart.y + 10))
-  
-  pygame.display.flip()
-  
+  shown = None
+
   waiting = True
   while waiting:
       for event in pygame.event.get():
@@ -250,4 +383,22 @@ def display_summary(screen):
                   waiting = False  # Salir del bucle para volver al menú inicial
           elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
               waiting = False
+
+      # Solo se redibuja cuando llega texto nuevo o termina el pedido
+      generating = request.is_alive()
+      text = request.text() if request.error is None else f"No se pudo generar el resumen: {request.error}"
+      if (text, generating) != shown:
+        shown = (text, generating)
+        screen.fill(WHITE)
+        for i, line in enumerate(divide_text(text, 12)):
+          screen.blit(text_font.render(line, True, BLACK), (50, 70 + i*20))
+        if generating:
+          screen.blit(font_large.render("Generando...", True, BLACK), (SCREEN_SIZE // 2 - 100, SCREEN_SIZE - 140))
+
+        # Botón para Volver al Menú Inicial
+        pygame.draw.rect(screen, RED, button_restart)
+        button_text = font_large.render("Reiniciar Simulación", True, WHITE)
+        screen.blit(button_text, (button_restart.x + 10, button_restart.y + 10))
+        pygame.display.flip()
+      clock.tick(30)
   
\ No newline at end of file
@@ -1,169 +1,185 @@
 # utils.py
 import csv
 import os
-import webcolors
+from functools import lru_cache
+
+import numpy as np
+
+COLOUR_PALETTE = {
+    "AliceBlue":"#F0F8FF",
+    "AntiqueWhite":"#FAEBD7",
+    "Aqua":"#00FFFF",
+    "Aquamarine":"#7FFFD4",
+    "Azure":"#F0FFFF",
+    "Beige":"#F5F5DC",
+    "Bisque":"#FFE4C4",
+    "Black":"#000000",
+    "BlanchedAlmond":"#FFEBCD",
+    "Blue":"#0000FF",
+    "BlueViolet":"#8A2BE2",
+    "Brown":"#A52A2A",
+    "BurlyWood":"#DEB887",
+    "CadetBlue":"#5F9EA0",
+    "Chartreuse":"#7FFF00",
+    "Chocolate":"#D2691E",
+    "Coral":"#FF7F50",
+    "CornflowerBlue":"#6495ED",
+    "Cornsilk":"#FFF8DC",
+    "Crimson":"#DC143C",
+    "Cyan":"#00FFFF",
+    "DarkBlue":"#00008B",
+    "DarkCyan":"#008B8B",
+    "DarkGoldenRod":"#B8860B",
+    "DarkGray":"#A9A9A9",
+    "DarkGrey":"#A9A9A9",
+    "DarkGreen":"#006400",
+    "DarkKhaki":"#BDB76B",
+    "DarkMagenta":"#8B008B",
+    "DarkOliveGreen":"#556B2F",
+    "DarkOrange":"#FF8C00",
+    "DarkOrchid":"#9932CC",
+    "DarkRed":"#8B0000",
+    "DarkSalmon":"#E9967A",
+    "DarkSeaGreen":"#8FBC8F",
+    "DarkSlateBlue":"#483D8B",
+    "DarkSlateGray":"#2F4F4F",
+    "DarkSlateGrey":"#2F4F4F",
+    "DarkTurquoise":"#00CED1",
+    "DarkViolet":"#9400D3",
+    "DeepPink":"#FF1493",
+    "DeepSkyBlue":"#00BFFF",
+    "DimGray":"#696969",
+    "DimGrey":"#696969",
+    "DodgerBlue":"#1E90FF",
+    "FireBrick":"#B22222",
+    "FloralWhite":"#FFFAF0",
+    "ForestGreen":"#228B22",
+    "Fuchsia":"#FF00FF",
+    "Gainsboro":"#DCDCDC",
+    "GhostWhite":"#F8F8FF",
+    "Gold":"#FFD700",
+    "GoldenRod":"#DAA520",
+    "Gray":"#808080",
+    "Grey":"#808080",
+    "Green":"#008000",
+    "GreenYellow":"#ADFF2F",
+    "HoneyDew":"#F0FFF0",
+    "HotPink":"#FF69B4",
+    "IndianRed ":"#CD5C5C",
+    "Indigo ":"#4B0082",
+    "Ivory":"#FFFFF0",
+    "Khaki":"#F0E68C",
+    "Lavender":"#E6E6FA",
+    "LavenderBlush":"#FFF0F5",
+    "LawnGreen":"#7CFC00",
+    "LemonChiffon":"#FFFACD",
+    "LightBlue":"#ADD8E6",
+    "LightCoral":"#F08080",
+    "LightCyan":"#E0FFFF",
+    "LightGoldenRodYellow":"#FAFAD2",
+    "LightGray":"#D3D3D3",
+    "LightGrey":"#D3D3D3",
+    "LightGreen":"#90EE90",
+    "LightPink":"#FFB6C1",
+    "LightSalmon":"#FFA07A",
+    "LightSeaGreen":"#20B2AA",
+    "LightSkyBlue":"#87CEFA",
+    "LightSlateGray":"#778899",
+    "LightSlateGrey":"#778899",
+    "LightSteelBlue":"#B0C4DE",
+    "LightYellow":"#FFFFE0",
+    "Lime":"#00FF00",
+    "LimeGreen":"#32CD32",
+    "Linen":"#FAF0E6",
+    "Magenta":"#FF00FF",
+    "Maroon":"#800000",
+    "MediumAquaMarine":"#66CDAA",
+    "MediumBlue":"#0000CD",
+    "MediumOrchid":"#BA55D3",
+    "MediumPurple":"#9370DB",
+    "MediumSeaGreen":"#3CB371",
+    "MediumSlateBlue":"#7B68EE",
+    "MediumSpringGreen":"#00FA9A",
+    "MediumTurquoise":"#48D1CC",
+    "MediumVioletRed":"#C71585",
+    "MidnightBlue":"#191970",
+    "MintCream":"#F5FFFA",
+    "MistyRose":"#FFE4E1",
+    "Moccasin":"#FFE4B5",
+    "NavajoWhite":"#FFDEAD",
+    "Navy":"#000080",
+    "OldLace":"#FDF5E6",
+    "Olive":"#808000",
+    "OliveDrab":"#6B8E23",
+    "Orange":"#FFA500",
+    "OrangeRed":"#FF4500",
+    "Orchid":"#DA70D6",
+    "PaleGoldenRod":"#EEE8AA",
+    "PaleGreen":"#98FB98",
+    "PaleTurquoise":"#AFEEEE",
+    "PaleVioletRed":"#DB7093",
+    "PapayaWhip":"#FFEFD5",
+    "PeachPuff":"#FFDAB9",
+    "Peru":"#CD853F",
+    "Pink":"#FFC0CB",
+    "Plum":"#DDA0DD",
+    "PowderBlue":"#B0E0E6",
+    "Purple":"#800080",
+    "RebeccaPurple":"#663399",
+    "Red":"#FF0000",
+    "RosyBrown":"#BC8F8F",
+    "RoyalBlue":"#041690",
+    "SaddleBrown":"#8B4513",
+    "Salmon":"#FA8072",
+    "SandyBrown":"#F4A460",
+    "SeaGreen":"#2E8B57",
+    "SeaShell":"#FFF5EE",
+    "Sienna":"#A0522D",
+    "Silver":"#C0C0C0",
+    "SkyBlue":"#87CEEB",
+    "SlateBlue":"#6A5ACD",
+    "SlateGray":"#708090",
+    "SlateGrey":"#708090",
+    "Snow":"#FFFAFA",
+    "SpringGreen":"#00FF7F",
+    "SteelBlue":"#4682B4",
+    "Tan":"#D2B48C",
+    "Teal":"#008080",
+    "Thistle":"#D8BFD8",
+    "Tomato":"#FF6347",
+    "Turquoise":"#40E0D0",
+    "Violet":"#EE82EE",
+    "Wheat":"#F5DEB3",
+    "White":"#FFFFFF",
+    "WhiteSmoke":"#F5F5F5",
+    "Yellow":"#FFFF00",
+    "YellowGreen":"#9ACD32"
+}
+
+@lru_cache(maxsize=None)
+def _palette():
+    """Paleta precalculada una sola vez (al primer uso): nombres y componentes RGB en un array de (N, 3)."""
+    import webcolors
+    names = list(COLOUR_PALETTE.keys())
+    rgb = np.array([tuple(webcolors.hex_to_rgb(key)) for key in COLOUR_PALETTE.values()], dtype=np.int64)
+    return names, rgb
+
+def closest_colours(requested_colours):
+    """Nombre del color de la paleta más cercano para cada color de un array (N, 3)."""
+    names, rgb = _palette()
+    requested = np.asarray(requested_colours, dtype=np.int64).reshape(-1, 1, 3)
+    distances = ((rgb[None, :, :] - requested) ** 2).sum(axis=2)
+    # Ante empates gana el último nombre de la paleta, como en la versión con diccionario.
+    last = len(names) - 1 - np.argmin(distances[:, ::-1], axis=1)
+    return [names[i] for i in last]
 
 def closest_colour(requested_colour):
-    my_colors = {
-        "AliceBlue":"#F0F8FF",
-        "AntiqueWhite":"#FAEBD7",
-        "Aqua":"#00FFFF",
-        "Aquamarine":"#7FFFD4",
-        "Azure":"#F0FFFF",
-        "Beige":"#F5F5DC",
-        "Bisque":"#FFE4C4",
-        "Black":"#000000",
-        "BlanchedAlmond":"#FFEBCD",
-        "Blue":"#0000FF",
-        "BlueViolet":"#8A2BE2",
-        "Brown":"#A52A2A",
-        "BurlyWood":"#DEB887",
-        "CadetBlue":"#5F9EA0",
-        "Chartreuse":"#7FFF00",
-        "Chocolate":"#D2691E",
-        "Coral":"#FF7F50",
-        "CornflowerBlue":"#6495ED",
-        "Cornsilk":"#FFF8DC",
-        "Crimson":"#DC143C",
-        "Cyan":"#00FFFF",
-        "DarkBlue":"#00008B",
-        "DarkCyan":"#008B8B",
-        "DarkGoldenRod":"#B8860B",
-        "DarkGray":"#A9A9A9",
-        "DarkGrey":"#A9A9A9",
-        "DarkGreen":"#006400",
-        "DarkKhaki":"#BDB76B",
-        "DarkMagenta":"#8B008B",
-        "DarkOliveGreen":"#556B2F",
-        "DarkOrange":"#FF8C00",
-        "DarkOrchid":"#9932CC",
-        "DarkRed":"#8B0000",
-        "DarkSalmon":"#E9967A",
-        "DarkSeaGreen":"#8FBC8F",
-        "DarkSlateBlue":"#483D8B",
-        "DarkSlateGray":"#2F4F4F",
-        "DarkSlateGrey":"#2F4F4F",
-        "DarkTurquoise":"#00CED1",
-        "DarkViolet":"#9400D3",
-        "DeepPink":"#FF1493",
-        "DeepSkyBlue":"#00BFFF",
-        "DimGray":"#696969",
-        "DimGrey":"#696969",
-        "DodgerBlue":"#1E90FF",
-        "FireBrick":"#B22222",
-        "FloralWhite":"#FFFAF0",
-        "ForestGreen":"#228B22",
-        "Fuchsia":"#FF00FF",
-        "Gainsboro":"#DCDCDC",
-        "GhostWhite":"#F8F8FF",
-        "Gold":"#FFD700",
-        "GoldenRod":"#DAA520",
-        "Gray":"#808080",
-        "Grey":"#808080",
-        "Green":"#008000",
-        "GreenYellow":"#ADFF2F",
-        "HoneyDew":"#F0FFF0",
-        "HotPink":"#FF69B4",
-        "IndianRed ":"#CD5C5C",
-        "Indigo ":"#4B0082",
-        "Ivory":"#FFFFF0",
-        "Khaki":"#F0E68C",
-        "Lavender":"#E6E6FA",
-        "LavenderBlush":"#FFF0F5",
-        "LawnGreen":"#7CFC00",
-        "LemonChiffon":"#FFFACD",
-        "LightBlue":"#ADD8E6",
-        "LightCoral":"#F08080",
-        "LightCyan":"#E0FFFF",
-        "LightGoldenRodYellow":"#FAFAD2",
-        "LightGray":"#D3D3D3",
-        "LightGrey":"#D3D3D3",
-        "LightGreen":"#90EE90",
-        "LightPink":"#FFB6C1",
-        "LightSalmon":"#FFA07A",
-        "LightSeaGreen":"#20B2AA",
-        "LightSkyBlue":"#87CEFA",
-        "LightSlateGray":"#778899",
-        "LightSlateGrey":"#778899",
-        "LightSteelBlue":"#B0C4DE",
-        "LightYellow":"#FFFFE0",
-        "Lime":"#00FF00",
-        "LimeGreen":"#32CD32",
-        "Linen":"#FAF0E6",
-        "Magenta":"#FF00FF",
-        "Maroon":"#800000",
-        "MediumAquaMarine":"#66CDAA",
-        "MediumBlue":"#0000CD",
-        "MediumOrchid":"#BA55D3",
-        "MediumPurple":"#9370DB",
-        "MediumSeaGreen":"#3CB371",
-        "MediumSlateBlue":"#7B68EE",
-        "MediumSpringGreen":"#00FA9A",
-        "MediumTurquoise":"#48D1CC",
-        "MediumVioletRed":"#C71585",
-        "MidnightBlue":"#191970",
-        "MintCream":"#F5FFFA",
-        "MistyRose":"#FFE4E1",
-        "Moccasin":"#FFE4B5",
-        "NavajoWhite":"#FFDEAD",
-        "Navy":"#000080",
-        "OldLace":"#FDF5E6",
-        "Olive":"#808000",
-        "OliveDrab":"#6B8E23",
-        "Orange":"#FFA500",
-        "OrangeRed":"#FF4500",
-        "Orchid":"#DA70D6",
-        "PaleGoldenRod":"#EEE8AA",
-        "PaleGreen":"#98FB98",
-        "PaleTurquoise":"#AFEEEE",
-        "PaleVioletRed":"#DB7093",
-        "PapayaWhip":"#FFEFD5",
-        "PeachPuff":"#FFDAB9",
-        "Peru":"#CD853F",
-        "Pink":"#FFC0CB",
-        "Plum":"#DDA0DD",
-        "PowderBlue":"#B0E0E6",
-        "Purple":"#800080",
-        "RebeccaPurple":"#663399",
-        "Red":"#FF0000",
-        "RosyBrown":"#BC8F8F",
-        "RoyalBlue":"#041690",
-        "SaddleBrown":"#8B4513",
-        "Salmon":"#FA8072",
-        "SandyBrown":"#F4A460",
-        "SeaGreen":"#2E8B57",
-        "SeaShell":"#FFF5EE",
-        "Sienna":"#A0522D",
-        "Silver":"#C0C0C0",
-        "SkyBlue":"#87CEEB",
-        "SlateBlue":"#6A5ACD",
-        "SlateGray":"#708090",
-        "SlateGrey":"#708090",
-        "Snow":"#FFFAFA",
-        "SpringGreen":"#00FF7F",
-        "SteelBlue":"#4682B4",
-        "Tan":"#D2B48C",
-        "Teal":"#008080",
-        "Thistle":"#D8BFD8",
-        "Tomato":"#FF6347",
-        "Turquoise":"#40E0D0",
-        "Violet":"#EE82EE",
-        "Wheat":"#F5DEB3",
-        "White":"#FFFFFF",
-        "WhiteSmoke":"#F5F5F5",
-        "Yellow":"#FFFF00",
-        "YellowGreen":"#9ACD32"
-    }
-    min_colours = {}
-    for name, key in my_colors.items():
-        r_c, g_c, b_c = webcolors.hex_to_rgb(key)
-        rd = (r_c - requested_colour[0]) ** 2
-        gd = (g_c - requested_colour[1]) ** 2
-        bd = (b_c - requested_colour[2]) ** 2
-        min_colours[(rd + gd + bd)] = name
-    return min_colours[min(min_colours.keys())]
+    return closest_colours([requested_colour])[0]
 
+@lru_cache(maxsize=None)
 def get_colour_name(requested_colour):
+    """Nombre del color; se calcula una vez por color (hay tantos como familias)."""
+    import webcolors
     try:
         closest_name = webcolors.rgb_to_name(requested_colour)
     except ValueError:
@@ -181,8 +197,12 @@ def divide_text(texto, max_palabras=10):
     
     return fragmentos
 
-def save_to_csv(population, filename="creatures.csv"):
-    """Guarda la información de todas las criaturas en un archivo CSV, agregando nuevas líneas con cada ejecución."""
+CSV_FIELDS = ["id", "color", "size", "speed", "time_alive", "food_eaten_total", "reproductions", "is_carnivore", "personality"]
+TMP_CSV_FIELDS = ["id", "family", "size", "speed", "time_alive", "food_eaten_total", "reproductions", "is_carnivore", "personality"]
+STREAM_BUFFER_ROWS = 1000  # Filas acumuladas antes de escribir al archivo
+
+def next_run_index():
+    """Devuelve el número único de ejecución guardado en index.txt y deja guardado el siguiente."""
     # Abro el archivo index para obtener el último numero único de ejecución para luego utilizarlo para almacenar los id.
     index = 0
     try:
@@ -194,49 +214,79 @@ def save_to_csv(population, filename="creatures.csv"):
     except:
         with open("index.txt", "w") as file:
             file.write(str(0))
-            
-    # Abrir el archivo en modo 'append' para agregar nuevas líneas en cada simulación.
-    with open(filename, "a", newline="") as csvfile:
-        fieldnames = ["id", "color", "size", "speed", "time_alive", "food_eaten_total", "reproductions", "is_carnivore", "personality"]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
+    return index
+
+class CreatureCsvStream:
+    """Exportador CSV en streaming: escribe cada criatura cuando sale de la simulación.
+
+    Las filas se arman como tuplas y se escriben por bloques con `csv.writer`. Se usa como
+    destino de `compact_population` (tiene `append` y `extend`) y al final se agregan las
+    sobrevivientes antes de `close`. Con `id_prefix` los ids quedan como "<corrida>_<id>".
+    """
+
+    def __init__(self, filename, fieldnames=TMP_CSV_FIELDS, mode="w", id_prefix=None, buffer_rows=STREAM_BUFFER_ROWS):
+        self.file = open(filename, mode, newline="")
+        self.writer = csv.writer(self.file)
+        self.id_prefix = id_prefix
+        self.buffer_rows = buffer_rows
+        self.rows = []
+        self.written = 0
         # Escribir el encabezado solo si el archivo está vacío
         if os.path.getsize(filename) == 0:
-            writer.writeheader()
-        
-        # Escribir la información de las criaturas
-        for creature in population:
-            writer.writerow({
-                "id": str(index) +"_"+ str(creature.id),
-                "color": get_colour_name(creature.parent_color),
-                "size": creature.size,
-                "speed": round(creature.speed, 2),
-                "time_alive": round(creature.time_alive, 2),
-                "food_eaten_total": creature.food_eaten_total,
-                "reproductions": creature.reproductions,
-                "is_carnivore": creature.is_carnivore,
-                "personality": creature.personality
-            })
+            self.writer.writerow(fieldnames)
 
-def generate_tmp_csv(population, filename="creaturestmp.csv"):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _row(self, creature):
+        return (
+            creature.id if self.id_prefix is None else f"{self.id_prefix}_{creature.id}",
+            get_colour_name(creature.parent_color),
+            creature.size,
+            round(creature.speed, 2),
+            round(creature.time_alive, 2),
+            creature.food_eaten_total,
+            creature.reproductions,
+            creature.is_carnivore,
+            creature.personality,
+        )
+
+    def append(self, creature):
+        self.rows.append(self._row(creature))
+        if len(self.rows) >= self.buffer_rows:
+            self.flush()
+
+    def extend(self, creatures):
+        for creature in creatures:
+            self.append(creature)
+
+    def flush(self):
+        self.writer.writerows(self.rows)
+        self.written += len(self.rows)
+        self.rows.clear()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+def open_run_exports(save_csv, filename="creatures.csv", tmp_filename="creaturestmp.csv"):
+    """Abre los exportadores de una corrida: creaturestmp.csv siempre y creatures.csv si se pidió."""
+    streams = [CreatureCsvStream(tmp_filename, TMP_CSV_FIELDS)]
+    if save_csv:
+        # Abrir el archivo en modo 'append' para agregar nuevas líneas en cada simulación.
+        streams.append(CreatureCsvStream(filename, CSV_FIELDS, mode="a", id_prefix=next_run_index()))
+    return streams
+
+def save_to_csv(population, filename="creatures.csv"):
     """Guarda la información de todas las criaturas en un archivo CSV, agregando nuevas líneas con cada ejecución."""
-    # Abrir el archivo en modo 'write' para sobreescribir en cada simulación.
-    with open(filename, "w", newline="") as csvfile:
-        fieldnames = ["id", "family", "size", "speed", "time_alive", "food_eaten_total", "reproductions", "is_carnivore", "personality"]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Escribir la información de las criaturas
-        for creature in population:
-            writer.writerow({
-                "id": creature.id,
-                "family": get_colour_name(creature.parent_color),
-                "size": creature.size,
-                "speed": round(creature.speed, 2),
-                "time_alive": round(creature.time_alive, 2),
-                "food_eaten_total": creature.food_eaten_total,
-                "reproductions": creature.reproductions,
-                "is_carnivore": creature.is_carnivore,
-                "personality": creature.personality
-            })
-    
\ No newline at end of file
+    with CreatureCsvStream(filename, CSV_FIELDS, mode="a", id_prefix=next_run_index()) as stream:
+        stream.extend(population)
+
+def generate_tmp_csv(population, filename="creaturestmp.csv"):
+    """Guarda la información de todas las criaturas en un archivo CSV, sobreescribiéndolo en cada simulación."""
+    with CreatureCsvStream(filename, TMP_CSV_FIELDS) as stream:
+        stream.extend(population)
@@ -0,0 +1,33 @@
+# world_summary.py
+from collections import Counter
+
+class WorldSummary:
+    """Herbívoros vivos (en total y por familia) y comida: lo que consultan las decisiones.
+
+    Se arma una vez por tick con las criaturas vivas (O(N)) y después cada consulta es
+    O(1). Las muertes por depredación durante el tick se descuentan con `remove`, así
+    las criaturas que se mueven después ven los mismos números que con un recorrido
+    completo de la población. La comida se lee del FoodField, que ya lleva su total.
+    """
+
+    def __init__(self, creatures=(), food_sources=None):
+        self.food_sources = food_sources
+        self.herbivores = 0
+        self.family_herbivores = Counter()  # parent_color -> herbívoros vivos de la familia
+        for creature in creatures:
+            self.add(creature)
+
+    def add(self, creature):
+        self._update(creature, 1)
+
+    def remove(self, creature):
+        self._update(creature, -1)
+
+    def _update(self, creature, amount):
+        if not creature.is_carnivore:
+            self.herbivores += amount
+            self.family_herbivores[creature.parent_color] += amount
+
+    def food(self):
+        """Unidades de comida en el mundo."""
+        return len(self.food_sources) if self.food_sources is not None else 0